@@ -0,0 +1,93 @@
+# Animation Math
+# Fixed-point trig tables, precomputed transforms and memoised scramble text
+# Install to: /lib/animath.py (shared by the mods)
+#
+# Idle animations only need a few degrees of precision, so per-frame
+# math.sin calls and Matrix chains are replaced with table lookups and
+# objects built once.
+
+import math
+import random
+from badgeware import Matrix
+
+# Sine table: SIN_STEPS entries per turn, values scaled by ONE (Q10 fixed point,
+# so x * isin(...) >> Q scales x by the sine)
+SIN_STEPS = 256
+Q = 10
+ONE = 1 << Q
+SIN_TABLE = [int(math.sin(2 * math.pi * i / SIN_STEPS) * ONE) for i in range(SIN_STEPS)]
+
+# One turn of sin(ticks / k) takes 2 * pi * k ms
+TWO_PI_MILLI = 6283  # 2 * pi * 1000
+
+
+def isin(step):
+    """Sine of step / SIN_STEPS turns, scaled by ONE"""
+    return SIN_TABLE[step % SIN_STEPS]
+
+
+def icos(step):
+    """Cosine of step / SIN_STEPS turns, scaled by ONE"""
+    return SIN_TABLE[(step + SIN_STEPS // 4) % SIN_STEPS]
+
+
+def _step(ticks, k):
+    # Reduce to one period first so everything stays a small int
+    period = TWO_PI_MILLI * k // 1000
+    return (ticks % period) * SIN_STEPS // period
+
+
+def sin_ticks(ticks, k):
+    """Fixed-point math.sin(ticks / k) for ticks in ms"""
+    return isin(_step(ticks, k))
+
+
+def cos_ticks(ticks, k):
+    """Fixed-point math.cos(ticks / k) for ticks in ms"""
+    return icos(_step(ticks, k))
+
+
+# ============================================================================
+# TRANSFORM KEYFRAMES
+# ============================================================================
+class Keyframes:
+    """Matrices for translate(x, y).rotate(angle).scale(s), one per angle step
+
+    Built lazily so unused steps cost nothing. 256 steps is ~1.4 degrees a
+    step - fine enough that a slow spin doesn't visibly tick.
+    """
+
+    def __init__(self, x, y, scale, steps=256):
+        self.x = x
+        self.y = y
+        self.scale = scale
+        self.steps = steps
+        self._frames = [None] * steps
+
+    def at(self, angle):
+        """The matrix for the nearest precomputed step to angle (degrees)"""
+        step = math.floor(angle * self.steps / 360 + 0.5) % self.steps
+        m = self._frames[step]
+        if m is None:
+            m = Matrix().translate(self.x, self.y).rotate(step * 360 / self.steps).scale(self.scale)
+            self._frames[step] = m
+        return m
+
+
+# ============================================================================
+# SCRAMBLE TEXT
+# ============================================================================
+SCRAMBLE_CHARS = "!\"£$%^&*()_+-={}[]:@~;'#<>?,./\\|"
+
+_scramble_bucket = None
+_scramble_text = ""
+
+
+def scramble(ticks, length=20, bucket_ms=100):
+    """Random placeholder text that changes once every bucket_ms"""
+    global _scramble_bucket, _scramble_text
+    bucket = ticks // bucket_ms
+    if bucket != _scramble_bucket:
+        _scramble_bucket = bucket
+        _scramble_text = "".join([random.choice(SCRAMBLE_CHARS) for _ in range(length)])
+    return _scramble_text
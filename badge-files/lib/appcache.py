@@ -0,0 +1,69 @@
+# App Cache
+# Keeps recently used app modules resident between launches
+# Install to: /lib/appcache.py (shared by the mods)
+#
+# Returning to a resident app skips both the import and its init() - its
+# module state (fonts, icons, fetched data) is still there. The least
+# recently used apps are fully unloaded once more than MAX_RESIDENT are kept
+# or the free heap drops below MIN_FREE.
+
+import gc
+import sys
+from collections import OrderedDict
+import gcpolicy
+
+# Host Python has no MicroPython heap introspection - only count apps there
+HAVE_HEAP = hasattr(gc, "mem_free")
+
+MAX_RESIDENT = 3
+MIN_FREE = 96 * 1024
+
+_apps = OrderedDict()  # path -> module, least recently used first
+
+
+def get(path):
+    """The resident module for path (now the most recently used), or None"""
+    app = _apps.pop(path, None)
+    if app is not None:
+        _apps[path] = app
+    return app
+
+
+def peek(path):
+    """The resident module for path without touching the LRU order"""
+    return _apps.get(path)
+
+
+def keep(path, app):
+    """Keep app resident as the most recently used"""
+    _apps.pop(path, None)
+    _apps[path] = app
+
+
+def unload(path):
+    """Forget path entirely, so its next launch imports it from scratch"""
+    app = _apps.pop(path, None)
+    if app is not None:
+        # Let the app drop subscriptions that would otherwise keep it alive
+        getattr(app, "on_unload", lambda: None)()
+    if path in sys.modules:
+        del sys.modules[path]
+
+
+def _tight():
+    if not HAVE_HEAP:
+        return False
+    gcpolicy.collect()
+    return gc.mem_free() < MIN_FREE
+
+
+def trim():
+    """Unload least recently used apps until within the count and heap budget"""
+    while _apps and (len(_apps) > MAX_RESIDENT or _tight()):
+        path = next(iter(_apps))
+        unload(path)
+        print(f"Unloaded {path}")
+
+
+def resident():
+    return list(_apps)
@@ -0,0 +1,50 @@
+# App Frame
+# The launcher's per-frame services around a running app's update()
+# Install to: /lib/appframe.py (shared by the mods)
+#
+# main.py starts every app with start() and runs it through wrap().
+# A HOME press ends the app at its next frame by returning MENU from it, so
+# the launcher shows the menu without a reset and resident apps survive.
+# tools/replay.py does the same on the host, so a replay measures the frame
+# the badge actually runs - input, sensors, GC, HUD and fade included.
+
+import buttons
+import sensors
+import gcpolicy
+import hud
+import fade
+import recorder
+
+MENU = "/system/apps/menu"
+
+
+def start(app_path):
+    """Reset the per-app services - call just before running app_path"""
+    gcpolicy.start_app(app_path)
+    recorder.app(app_path)
+    fade.fade_in()
+    # Presses made while the last app closed are not for this one
+    buttons.clear()
+
+
+def wrap(update):
+    """Wrap an app's update() with the launcher's per-frame services"""
+    def frame():
+        if buttons.home():
+            return MENU
+        # run() calls display.update() after each update(), so this is the
+        # idle point between two frames, and the last frame is now on screen
+        buttons.presented()
+        # Battery/charging/WiFi samples that are due, and their change events
+        sensors.poll()
+        gcpolicy.frame()
+        hud.frame()
+        # This frame's buttons, when recording a session trace
+        recorder.frame()
+        result = update()
+        # Backlight fade (or overlay fallback) while an app fades in
+        fade.draw()
+        # Overlay on top of the app (hold UP+DOWN to toggle)
+        hud.draw()
+        return result
+    return frame
@@ -0,0 +1,35 @@
+# App Index
+# Discovers launchable apps once and shares the list with the menus
+# Install to: /lib/appindex.py (shared by the mods)
+
+import os
+from badgeware import is_dir, file_exists
+
+APPS_ROOT = "/system/apps"
+HIDDEN = ("menu", "startup")
+
+_apps = None
+
+
+def build():
+    """Scan APPS_ROOT and return a sorted list of (name, path) tuples"""
+    global _apps
+    found = []
+    for entry in os.listdir(APPS_ROOT):
+        app_path = f"{APPS_ROOT}/{entry}"
+        if entry not in HIDDEN and is_dir(app_path) and file_exists(f"{app_path}/__init__.py"):
+            found.append((entry, entry))
+    found.sort(key=lambda x: x[0].lower())
+    _apps = found
+    return found
+
+
+def apps():
+    """The app list, building it on first use"""
+    if _apps is None:
+        try:
+            build()
+        except Exception as e:
+            print(f"Error discovering apps: {e}")
+            return []
+    return _apps
@@ -0,0 +1,137 @@
+# App Menu
+# Grid paging, list mode and icon loading shared by the menu mods
+# Install to: /lib/appmenu.py (shared by the mods)
+#
+# An AppMenu pages through apps COLS x ROWS at a time, or - past list_after
+# apps, or always with view="list" - scrolls them in a listview.VirtualList.
+# The menus keep their own look: they draw the grid themselves, and
+# draw_list() calls back into them for each row on screen.
+
+import math
+import listview
+import pool
+import assets
+import assetpack
+from badgeware import screen, io, file_exists
+
+DEFAULT_ICON = "/system/apps/menu/default_icon.png"
+
+
+def load_icon(path):
+    """The icon of the app in /system/apps/path, or None if it won't load"""
+    try:
+        icon_path = f"/system/apps/{path}/icon.png"
+        # Packed icons need no directory lookup at all
+        if assetpack.packed(icon_path) or file_exists(icon_path):
+            return assets.load_image(icon_path)
+        # Default icon - one shared copy
+        return assets.image(DEFAULT_ICON)
+    except Exception as e:
+        print(f"Icon load error for {path}: {e}")
+        return None
+
+
+class AppMenu:
+    def __init__(self, apps, cols, rows, view, list_after, row_h, top, height):
+        self.apps = apps
+        self.per_page = cols * rows
+        self.pages = max(1, math.ceil(len(apps) / self.per_page))
+        self.page = 0
+        self.active = 0
+        # (button, change in active) - UP/DOWN move a whole row
+        self.moves = ((io.BUTTON_C, 1), (io.BUTTON_A, -1), (io.BUTTON_UP, -cols), (io.BUTTON_DOWN, cols))
+
+        if view == "list" or (view == "auto" and len(apps) > list_after):
+            self.listing = listview.VirtualList([app[0] for app in apps], row_h, top, height, self._bind)
+        else:
+            self.listing = None
+
+    def _bind(self, row, index):
+        """Point a recycled list row at apps[index]"""
+        name, path = self.apps[index]
+        row.name = name
+        if row.path != path:
+            row.path = path
+            # Let the old sprite go before decoding the new one
+            row.sprite = None
+            row.sprite = load_icon(path)
+
+    def page_len(self, page):
+        return min(self.per_page, len(self.apps) - page * self.per_page)
+
+    def step(self, page, active, delta):
+        """Apply one move with the menu's page wrapping - returns (page, active)"""
+        active += delta
+        if active >= self.page_len(page):
+            page = page + 1 if page < self.pages - 1 else 0
+            active = 0
+        elif active < 0:
+            page = page - 1 if page > 0 else self.pages - 1
+            active = self.page_len(page) - 1
+        return page, active
+
+    def navigate(self, presses):
+        """Apply this frame's presses from buttons.take() - True if the grid
+        moved to another page, which the menu then loads once"""
+        listing = self.listing
+        if listing:
+            # UP/DOWN step through apps, A/C jump between first letters
+            listing.move(presses.get(io.BUTTON_DOWN, 0) - presses.get(io.BUTTON_UP, 0))
+            for _ in range(presses.get(io.BUTTON_C, 0)):
+                listing.jump(1)
+            for _ in range(presses.get(io.BUTTON_A, 0)):
+                listing.jump(-1)
+            listing.update()
+            return False
+
+        # Every queued press counts, but the page loads only once
+        page, active = self.page, self.active
+        for button, delta in self.moves:
+            for _ in range(presses.get(button, 0)):
+                page, active = self.step(page, active, delta)
+        self.active = active
+        if page == self.page:
+            return False
+        self.page = page
+        return True
+
+    def selected(self):
+        """Index into apps of the highlighted app (may be past the end if none)"""
+        if self.listing:
+            return self.listing.selected
+        return self.page * self.per_page + self.active
+
+    def position(self):
+        """Where the selection is, as "n/total" - None with a single grid page"""
+        if self.listing:
+            return f"{self.listing.selected + 1}/{self.listing.count}"
+        if self.pages > 1:
+            return f"{self.page + 1}/{self.pages}"
+        return None
+
+    def suspend(self):
+        """Where the menu was, for snapshot.deepsleep()"""
+        return {"page": self.page, "active": self.active, "selected": self.listing.selected if self.listing else 0}
+
+    def resume(self, state):
+        """Restore suspend()'s state - True if the grid page changed"""
+        if self.listing:
+            self.listing.select(state.get("selected", 0))
+            self.listing.settle()
+            return False
+        self.page = min(max(0, state.get("page", 0)), self.pages - 1)
+        self.active = min(max(0, state.get("active", 0)), max(0, self.page_len(self.page) - 1))
+        return True
+
+    def draw_list(self, draw_row, bar_x, track, thumb):
+        """Draw only the rows on screen with draw_row(row, y, is_active), then
+        the scrollbar - the menu's header and footer cover the overflow"""
+        listing = self.listing
+        for i in range(listing.first, listing.last):
+            draw_row(listing.row(i), listing.y(i), i == listing.selected)
+
+        ty, th = listing.thumb()
+        screen.brush = track
+        screen.draw(pool.rect(bar_x, listing.top, 2, listing.height))
+        screen.brush = thumb
+        screen.draw(pool.rect(bar_x, ty, 2, th))
@@ -0,0 +1,353 @@
+# Asset Pack
+# Fonts and icons read in place from one read-only, indexed blob
+# Install to: /lib/assetpack.py (shared by the mods)
+#
+# tools/pack_assets.py packs the system fonts, every app's icon.png and the
+# menu's default icon into PACK_FILE. On boot the launcher install()s it into
+# the firmware's ROMFS flash segment - only if that segment is unused - where
+# it is XIP-mapped, so an entry is a memoryview of flash instead of a buffered
+# read into the heap. Icons packed as raw pixels become Images over that
+# memory directly; everything else is served by a read-only filesystem at
+# MOUNT, so PixelFont.load and Image.load skip the FAT directory walk. With no
+# ROM segment the pack is read from PACK_FILE: still one file for everything.
+#
+# PACK_FILE stays the source of truth: delete it and the copy in ROM is
+# ignored too. A file changed after the pack was made (newer than PACK_FILE,
+# or a different size) is loaded from disk until the pack is rebuilt.
+#
+# Layout (little-endian):
+#   header  HEADER below - the CRC32 covers everything after the header
+#   index   per entry: ENTRY below, then the name (the path on the badge)
+#   data    each entry's bytes, ALIGN-byte aligned
+
+import io
+import os
+import struct
+import binascii
+from badgeware import Image
+
+try:
+    import vfs
+except ImportError:
+    vfs = None
+
+try:
+    import uctypes
+except ImportError:
+    uctypes = None
+
+MAGIC = b"BPAK"
+VERSION = 1
+# magic, version, entry count, index length, pack size, crc32
+HEADER = "<4sHHIII"
+HEADER_SIZE = struct.calcsize(HEADER)
+# offset, length, width, height, kind, name length
+ENTRY = "<IIHHBB"
+ENTRY_SIZE = struct.calcsize(ENTRY)
+ALIGN = 8
+
+KIND_FILE = 0    # the file's bytes, as on disk
+KIND_PIXELS = 1  # decoded RGBA8888, width * height * 4 bytes
+
+PACK_FILE = "/assets.bin"
+MOUNT = "/pack"
+ROM_SEGMENT = 0
+
+_index = None    # path -> (offset, length, width, height, kind)
+_rom = None      # the XIP-mapped pack, when it is in ROM
+_mounted = False
+_built = 0       # PACK_FILE's mtime
+_fresh = {}      # path -> whether its packed copy is current, once checked
+
+# Stream ioctl requests (py/stream.h)
+MP_STREAM_FLUSH = 1
+MP_STREAM_SEEK = 2
+MP_STREAM_CLOSE = 4
+EINVAL = 22
+# MP_STREAM_SEEK's argument: mp_off_t offset (in and out), int whence
+SEEK_ARGS = {"offset": 0 | uctypes.INT32, "whence": 4 | uctypes.INT32} if uctypes else None
+
+
+def _segment():
+    """The ROMFS segment as a memoryview of flash, or None without one"""
+    if vfs is None or not hasattr(vfs, "rom_ioctl"):
+        return None
+    try:
+        if vfs.rom_ioctl(1) <= ROM_SEGMENT:
+            return None
+        return vfs.rom_ioctl(2, ROM_SEGMENT)
+    except Exception:
+        return None
+
+
+def _parse(head, index):
+    entries = {}
+    pos = 0
+    for _ in range(head[2]):
+        offset, length, w, h, kind, name_len = struct.unpack_from(ENTRY, index, pos)
+        pos += ENTRY_SIZE
+        entries[str(index[pos:pos + name_len], "utf-8")] = (offset, length, w, h, kind)
+        pos += name_len
+    return entries
+
+
+def _from_rom(seg):
+    if len(seg) < HEADER_SIZE or bytes(seg[:4]) != MAGIC:
+        return None
+    head = struct.unpack_from(HEADER, seg, 0)
+    if head[1] != VERSION:
+        return None
+    # XIP reads are fast - check the whole pack once per boot
+    size = head[4]
+    if size > len(seg) or binascii.crc32(seg[HEADER_SIZE:size]) & 0xFFFFFFFF != head[5]:
+        print("Asset pack in ROM failed its checksum")
+        return None
+    return _parse(head, seg[HEADER_SIZE:HEADER_SIZE + head[3]])
+
+
+def _from_file():
+    try:
+        with open(PACK_FILE, "rb") as f:
+            head = f.read(HEADER_SIZE)
+            if len(head) < HEADER_SIZE or head[:4] != MAGIC:
+                return None
+            head = struct.unpack(HEADER, head)
+            if head[1] != VERSION:
+                return None
+            return _parse(head, f.read(head[3]))
+    except OSError:
+        return None
+
+
+def _load():
+    global _index, _rom, _built
+    if _index is None:
+        try:
+            _built = os.stat(PACK_FILE)[8]
+        except OSError:
+            # Deleted to retire the pack - don't serve the copy in ROM either
+            _index = {}
+            return _index
+        seg = _segment()
+        entries = _from_rom(seg) if seg is not None else None
+        if entries is not None:
+            _rom = seg
+        else:
+            entries = _from_file()
+        _index = entries or {}
+    return _index
+
+
+def _current(path):
+    """path's index entry, unless it isn't packed or its file changed since"""
+    entry = _load().get(path)
+    if entry is None:
+        return None
+    fresh = _fresh.get(path)
+    if fresh is None:
+        try:
+            st = os.stat(path)
+            # Raw pixels can't be compared by size - the mtime still tells
+            fresh = st[8] <= _built and (entry[4] != KIND_FILE or st[6] == entry[1])
+        except OSError:
+            fresh = True  # only in the pack
+        _fresh[path] = fresh
+    return entry if fresh else None
+
+
+def packed(path):
+    return _current(path) is not None
+
+
+def data(path):
+    """An entry's bytes - a view of flash when the pack is in ROM, else a copy"""
+    entry = _load().get(path)
+    if entry is None:
+        return None
+    offset, length = entry[0], entry[1]
+    if _rom is not None:
+        return _rom[offset:offset + length]
+    buf = bytearray(length)
+    with open(PACK_FILE, "rb") as f:
+        f.seek(offset)
+        f.readinto(buf)
+    return buf
+
+
+def image(path):
+    """An Image over the packed raw pixels for path, or None if not packed so"""
+    entry = _current(path)
+    if entry is None or entry[4] != KIND_PIXELS:
+        return None
+    pixels = data(path)
+    try:
+        try:
+            return Image(entry[2], entry[3], pixels)
+        except TypeError:
+            # Wants a writable buffer - a copy still skips the PNG decode
+            return Image(entry[2], entry[3], bytearray(pixels))
+    except Exception as e:
+        print(f"Packed image error for {path}: {e}")
+        return None
+
+
+def path(name):
+    """Where to load name from - inside MOUNT if it is packed there"""
+    if _mounted and _current(name) is not None:
+        return MOUNT + name
+    return name
+
+
+class _PackFile(io.IOBase):
+    """Read-only stream over one entry"""
+
+    def __init__(self, buf):
+        self._buf = buf
+        self._pos = 0
+
+    def readinto(self, buf):
+        n = min(len(buf), len(self._buf) - self._pos)
+        buf[:n] = self._buf[self._pos:self._pos + n]
+        self._pos += n
+        return n
+
+    def read(self, size=-1):
+        end = len(self._buf) if size is None or size < 0 else min(len(self._buf), self._pos + size)
+        chunk = bytes(self._buf[self._pos:end])
+        self._pos = end
+        return chunk
+
+    def seek(self, offset, whence=0):
+        base = (0, self._pos, len(self._buf))[whence]
+        self._pos = max(0, min(len(self._buf), base + offset))
+        return self._pos
+
+    def tell(self):
+        return self._pos
+
+    def ioctl(self, req, arg):
+        if req == MP_STREAM_FLUSH:
+            return 0
+        if req == MP_STREAM_CLOSE:
+            self.close()
+            return 0
+        if req == MP_STREAM_SEEK and SEEK_ARGS is not None:
+            args = uctypes.struct(arg, SEEK_ARGS)
+            args.offset = self.seek(args.offset, args.whence)
+            return 0
+        return -EINVAL
+
+    def close(self):
+        self._buf = None
+
+
+class _PackFS:
+    """The pack as a read-only filesystem - paths are the names in the index"""
+
+    def mount(self, readonly, mkfs):
+        pass
+
+    def umount(self):
+        pass
+
+    def _is_dir(self, name):
+        prefix = name.rstrip("/") + "/"
+        return any(key.startswith(prefix) for key in _load())
+
+    def open(self, name, mode="r"):
+        if "w" in mode or "a" in mode or "+" in mode:
+            raise OSError(30)  # EROFS
+        buf = data(name)
+        if buf is None:
+            raise OSError(2)  # ENOENT
+        return _PackFile(buf)
+
+    def stat(self, name):
+        entry = _load().get(name)
+        if entry is not None:
+            return (0x8000, 0, 0, 0, 0, 0, entry[1], 0, 0, 0)
+        if name in ("", "/") or self._is_dir(name):
+            return (0x4000, 0, 0, 0, 0, 0, 0, 0, 0, 0)
+        raise OSError(2)
+
+    def ilistdir(self, name):
+        prefix = name.rstrip("/") + "/"
+        seen = set()
+        for key, entry in _load().items():
+            if not key.startswith(prefix):
+                continue
+            child, _, rest = key[len(prefix):].partition("/")
+            if child not in seen:
+                seen.add(child)
+                yield (child, 0x4000 if rest else 0x8000, 0, 0 if rest else entry[1])
+
+    def chdir(self, name):
+        pass
+
+    def getcwd(self):
+        return "/"
+
+    def statvfs(self, name):
+        return (512, 512, 0, 0, 0, 0, 0, 0, 0, 255)
+
+
+def mount():
+    """Serve the pack at MOUNT - False if there is no pack or no VFS to mount on"""
+    global _mounted
+    if _mounted:
+        return True
+    if vfs is None or not _load():
+        return False
+    try:
+        vfs.mount(_PackFS(), MOUNT, readonly=True)
+    except Exception as e:
+        print(f"Could not mount asset pack: {e}")
+        return False
+    _mounted = True
+    return True
+
+
+def install():
+    """Copy PACK_FILE into the ROM segment, unless it is there already or the
+    segment holds something else - True if the pack is in ROM afterwards"""
+    global _index, _rom
+    seg = _segment()
+    if seg is None:
+        return False
+    try:
+        size = os.stat(PACK_FILE)[6]
+        with open(PACK_FILE, "rb") as f:
+            head = f.read(HEADER_SIZE)
+    except OSError:
+        return False
+    if len(seg) >= HEADER_SIZE and bytes(seg[:HEADER_SIZE]) == head:
+        return True
+    # Erased flash reads 0xFF - never overwrite a ROMFS image we didn't write
+    if size > len(seg) or (seg[0] != 0xFF and bytes(seg[:4]) != MAGIC):
+        return False
+
+    try:
+        block = vfs.rom_ioctl(3, ROM_SEGMENT, size)
+        if block < 0:
+            return False
+        buf = bytearray(4096)
+        offset = 0
+        with open(PACK_FILE, "rb") as f:
+            while n := f.readinto(buf):
+                # Writes are whole blocks - pad the last one with erased bytes
+                while n % block:
+                    buf[n] = 0xFF
+                    n += 1
+                vfs.rom_ioctl(4, ROM_SEGMENT, offset, memoryview(buf)[:n])
+                offset += n
+        vfs.rom_ioctl(5, ROM_SEGMENT)
+    except Exception as e:
+        print(f"Asset pack install failed: {e}")
+        return False
+
+    # Re-read the index from ROM next time it is needed
+    _index = None
+    _rom = None
+    _fresh.clear()
+    print(f"Installed {PACK_FILE} ({size} bytes) into ROM")
+    return True
@@ -0,0 +1,50 @@
+# Asset Cache
+# Loads fonts and images once and shares them between apps
+# Install to: /lib/assets.py (shared by the mods)
+#
+# Library modules stay in sys.modules when the launcher switches apps, so
+# anything loaded here (e.g. pre-warmed by bootlog-startup) survives the
+# switch instead of being read from flash again. Anything in the asset pack
+# is read from there - see assetpack.py.
+
+from badgeware import PixelFont, Image
+import assetpack
+
+FONT_SMALL = "/system/assets/fonts/ark.ppf"
+FONT_LARGE = "/system/assets/fonts/absolute.ppf"
+
+_fonts = {}
+_images = {}
+
+
+def font(path):
+    """Load a PixelFont once - None if it can't be loaded"""
+    if path not in _fonts:
+        try:
+            _fonts[path] = PixelFont.load(assetpack.path(path))
+        except Exception as e:
+            print(f"Font load error for {path}: {e}")
+            _fonts[path] = None
+    return _fonts[path]
+
+
+def image(path):
+    """Load an Image once - None if it can't be loaded"""
+    if path not in _images:
+        try:
+            _images[path] = load_image(path)
+        except Exception as e:
+            print(f"Image load error for {path}: {e}")
+            _images[path] = None
+    return _images[path]
+
+
+def load_image(path):
+    """Load an Image without caching it - in place from the pack if packed as pixels"""
+    return assetpack.image(path) or Image.load(assetpack.path(path))
+
+
+def forget_images():
+    """Drop cached images (fonts are small and kept)"""
+    global _images
+    _images = {}
@@ -0,0 +1,130 @@
+# Atomic Cache Files
+# Crash-safe writes and verified reads for the files the mods cache on flash
+# Install to: /lib/atomic.py (shared by the mods)
+#
+# A file is written next to its destination, flushed and synced, then renamed
+# over it - a reset part way through leaves the old copy or the new one, never
+# a truncated mix. A tiny "<path>.sum" sidecar records the length and CRC32 so
+# readers can tell a complete file from whatever else is on flash.
+
+import os
+import binascii
+
+CHUNK = 512
+
+
+def sum_path(path):
+    return path + ".sum"
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def _sync():
+    # Push the filesystem's cached blocks out before renaming over anything
+    try:
+        os.sync()
+    except (AttributeError, OSError):
+        pass
+
+
+def _replace(src, dst):
+    try:
+        os.rename(src, dst)
+    except OSError:
+        # FAT can't rename over an existing file
+        _remove(dst)
+        os.rename(src, dst)
+
+
+def checksum(path):
+    """(length, crc32) of the file at path - reads it in small chunks"""
+    buf = bytearray(CHUNK)
+    view = memoryview(buf)
+    length = 0
+    crc = 0
+    with open(path, "rb") as f:
+        while (n := f.readinto(buf)) > 0:
+            crc = binascii.crc32(view[:n], crc)
+            length += n
+    return length, crc & 0xFFFFFFFF
+
+
+def _write_sum(path, length, crc):
+    tmp = sum_path(path) + ".tmp"
+    with open(tmp, "w") as f:
+        f.write(f"{length} {crc}")
+        f.flush()
+    _replace(tmp, sum_path(path))
+
+
+def commit(tmp, path, sidecar=True):
+    """Move the fully written file tmp into place at path"""
+    _sync()
+    if sidecar:
+        length, crc = checksum(tmp)
+    else:
+        # Caller's format carries its own checksum - drop any stale sidecar
+        _remove(sum_path(path))
+    _replace(tmp, path)
+    if sidecar:
+        # Written after the data: a reset in between leaves a sum that
+        # doesn't match, so the file reads as invalid rather than trusted
+        _write_sum(path, length, crc)
+    _sync()
+
+
+def write(path, data, sidecar=True):
+    """Atomically replace path with data (bytes, str or a list of buffers)"""
+    tmp = path + ".tmp"
+    try:
+        with open(tmp, "wb") as f:
+            for part in (data if isinstance(data, (list, tuple)) else (data,)):
+                if part is not None:
+                    f.write(part.encode() if isinstance(part, str) else part)
+            f.flush()
+        commit(tmp, path, sidecar)
+        return True
+    except Exception as e:
+        print(f"Failed to write {path}: {e}")
+        _remove(tmp)
+        return False
+
+
+def valid(path):
+    """True if path exists and matches the length and CRC in its sidecar"""
+    try:
+        with open(sum_path(path), "r") as f:
+            length, crc = (int(v) for v in f.read().split())
+        if os.stat(path)[6] != length:
+            return False
+        return checksum(path) == (length, crc)
+    except (OSError, ValueError):
+        return False
+
+
+def read(path):
+    """Contents of path as bytes if it verifies, otherwise None"""
+    try:
+        with open(sum_path(path), "r") as f:
+            length, crc = (int(v) for v in f.read().split())
+        buf = bytearray(length)
+        with open(path, "rb") as f:
+            if f.readinto(buf) != length or f.read(1):
+                return None
+    except (OSError, ValueError):
+        return None
+    if binascii.crc32(buf) & 0xFFFFFFFF != crc:
+        print(f"{path} failed its checksum")
+        return None
+    return buf
+
+
+def remove(path):
+    """Delete path along with its sidecar and any leftover temporary file"""
+    for p in (path, sum_path(path), path + ".tmp"):
+        _remove(p)
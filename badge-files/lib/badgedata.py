@@ -0,0 +1,189 @@
+# Badge Data File
+# Compact single-file cache of everything the badge app shows
+# Install to: /lib/badgedata.py (shared by the mods)
+#
+# Layout (little-endian):
+#   header   32 bytes, see HEADER below
+#   name     name_len bytes (utf-8)
+#   handle   handle_len bytes (utf-8)
+#   grid     GRID_CELLS bytes, contribution level per day, row-major (day * WEEKS + week)
+#   avatar   avatar_w * avatar_h * bytes-per-pixel raw pixels (may be empty)
+#
+# The checksum is a CRC32 of the header (with the checksum field zeroed) and
+# the payload, so a truncated or torn file is rejected as a whole. Saves go
+# through atomic.write, so a reset mid-save keeps the previous copy.
+#
+# Each GitHub handle gets its own cache directory under PROFILES_DIR, so a
+# badge rotating through several profiles never overwrites one with another.
+
+import os
+import struct
+import binascii
+import atomic
+from collections import namedtuple
+from badgeware import Image
+
+MAGIC = b"BDGE"
+VERSION = 1
+
+WEEKS = 53
+DAYS = 7
+GRID_CELLS = WEEKS * DAYS
+
+# magic, version, name_len, handle_len, reserved, followers, repos, contribs,
+# avatar_w, avatar_h, payload_len, checksum
+HEADER = "<4sBBBBIIIHHII"
+HEADER_SIZE = struct.calcsize(HEADER)
+CHECKSUM_OFFSET = HEADER_SIZE - 4
+
+PROFILES_DIR = "/profiles"
+BADGE_FILE = "badge.bin"
+# Everything cached per handle - badge.bin plus what it is built from
+PROFILE_FILES = (BADGE_FILE, "user_data.json", "avatar.png")
+# Only downloaded when contributions aren't streamed into badge.bin
+CONTRIB_FILE = "contrib_data.json"
+
+_folders = set()  # directories already made this boot
+
+BadgeData = namedtuple("BadgeData", ("name", "handle", "followers", "repos", "contribs", "grid", "avatar"))
+
+
+def profile_path(handle, name=BADGE_FILE):
+    """Path of a cache file in handle's namespace - see make_folder()"""
+    return f"{PROFILES_DIR}/{handle.lower()}/{name}"
+
+
+def make_folder(path):
+    """Create the profile directory path is in - call before writing there"""
+    folder = path.rsplit("/", 1)[0]
+    if folder not in _folders:
+        for each in (PROFILES_DIR, folder):
+            try:
+                os.mkdir(each)
+            except OSError:
+                pass  # already there
+        _folders.add(folder)
+
+
+def migrate(handle):
+    """Move a cache from before per-handle directories (straight under /)
+    into handle's - or drop it where handle already has its own copy"""
+    for name in PROFILE_FILES + (CONTRIB_FILE,):
+        old = f"/{name}"
+        try:
+            os.stat(old)
+        except OSError:
+            continue
+        new = profile_path(handle, name)
+        try:
+            os.stat(new)
+        except OSError:
+            make_folder(new)
+            try:
+                os.rename(atomic.sum_path(old), atomic.sum_path(new))
+                os.rename(old, new)
+                print(f"Moved {old} to {new}")
+            except OSError:
+                pass
+        # Whatever is left over - the copy we didn't need, partial downloads
+        atomic.remove(old)
+        for leftover in (old + ".part", old + ".part.meta"):
+            try:
+                os.remove(leftover)
+            except OSError:
+                pass
+
+
+def utf8_prefix(text, limit=255):
+    """text encoded, cut to at most limit bytes without splitting a character"""
+    data = (text or "").encode()
+    if len(data) <= limit:
+        return data
+    end = limit
+    # Back off continuation bytes (10xxxxxx) to the start of that character
+    while end and data[end] & 0xC0 == 0x80:
+        end -= 1
+    return data[:end]
+
+
+def image_pixels(img):
+    """Raw pixels of a badgeware Image, or None if it has no buffer to share"""
+    try:
+        return memoryview(img)
+    except TypeError:
+        return None
+
+
+def image_from_pixels(w, h, pixels):
+    try:
+        return Image(w, h, pixels)
+    except Exception:
+        return None
+
+
+def save(path, name, handle, followers, repos, contribs, grid, avatar=None):
+    """Write the badge data in one go - returns True on success"""
+    name_bytes = utf8_prefix(name)
+    handle_bytes = utf8_prefix(handle)
+    pixels = image_pixels(avatar) if avatar else None
+    avatar_w, avatar_h = (avatar.width, avatar.height) if pixels is not None else (0, 0)
+    payload_len = len(name_bytes) + len(handle_bytes) + GRID_CELLS + (len(pixels) if pixels is not None else 0)
+
+    header = bytearray(HEADER_SIZE)
+    struct.pack_into(HEADER, header, 0, MAGIC, VERSION, len(name_bytes), len(handle_bytes), 0,
+                     followers or 0, repos or 0, contribs or 0, avatar_w, avatar_h, payload_len, 0)
+
+    crc = binascii.crc32(header)
+    for part in (name_bytes, handle_bytes, grid, pixels):
+        if part is not None:
+            crc = binascii.crc32(part, crc)
+    struct.pack_into("<I", header, CHECKSUM_OFFSET, crc & 0xFFFFFFFF)
+
+    make_folder(path)
+    return atomic.write(path, [header, name_bytes, handle_bytes, grid, pixels])
+
+
+def load(path):
+    """Read and verify the badge data with a single readinto - None if invalid
+
+    avatar is an Image when raw pixels were stored, otherwise None.
+    """
+    try:
+        size = os.stat(path)[6]
+        if size < HEADER_SIZE + GRID_CELLS:
+            return None
+        buf = bytearray(size)
+        with open(path, "rb") as f:
+            if f.readinto(buf) != size:
+                return None
+    except OSError:
+        return None
+
+    (magic, version, name_len, handle_len, _, followers, repos, contribs,
+     avatar_w, avatar_h, payload_len, checksum) = struct.unpack_from(HEADER, buf, 0)
+    if magic != MAGIC or version != VERSION or HEADER_SIZE + payload_len != size:
+        return None
+
+    view = memoryview(buf)
+    struct.pack_into("<I", buf, CHECKSUM_OFFSET, 0)
+    if binascii.crc32(view) & 0xFFFFFFFF != checksum:
+        print(f"{path} failed its checksum")
+        return None
+
+    pos = HEADER_SIZE
+    try:
+        name = str(view[pos:pos + name_len], "utf-8")
+        pos += name_len
+        handle = str(view[pos:pos + handle_len], "utf-8")
+        pos += handle_len
+    except UnicodeError:
+        # Written by an older build that could cut a character in half
+        return None
+    grid = view[pos:pos + GRID_CELLS]
+    pos += GRID_CELLS
+
+    avatar = None
+    if avatar_w and avatar_h:
+        avatar = image_from_pixels(avatar_w, avatar_h, view[pos:])
+
+    return BadgeData(name, handle, followers, repos, contribs, grid, avatar)
@@ -0,0 +1,227 @@
+# Button Events
+# IRQ-fed, timestamped button queue with press-to-photon latency tracking
+# Install to: /lib/buttons.py (shared by the mods)
+#
+# io.pressed is sampled once per frame, so a tap that starts and ends during
+# a slow frame is lost and a press is only seen a frame late. Pin IRQs push
+# (button, ticks) into a fixed ring instead; update() drains it once with
+# take(), which coalesces repeats into a count per button. The launcher calls
+# presented() after each display.update(), giving the time from the oldest
+# press to the frame that showed its result.
+#
+# The buttons pull low when pressed. A falling edge only counts once the pin
+# has been high for DEBOUNCE_MS, so contact bounce on press or release never
+# queues a phantom press. The handlers are hard IRQs, so the level they read
+# is the one just after the edge - a soft IRQ runs when the scheduler gets to
+# it, and a tap inside one long C call (a display flush, a flash write) would
+# read as released twice. They never allocate, as hard IRQs must not.
+#
+# HOME is not queued: its press only raises a flag that home() hands to the
+# launcher, which ends the running app at its next frame.
+
+import time
+from badgeware import io
+
+try:
+    import machine
+except ImportError:
+    machine = None
+
+QUEUE_SIZE = 16
+DEBOUNCE_MS = 30
+
+# Holding a navigation button repeats it, frame-rate independent
+REPEATING = ("A", "C", "UP", "DOWN")
+REPEAT_DELAY_MS = 400
+REPEAT_MS = 120
+
+# Latency histogram bucket upper bounds (ms); the last bucket is open-ended
+BUCKETS = (16, 33, 50, 100, 200, 500)
+
+NAMES = ("A", "B", "C", "UP", "DOWN", "LEFT", "RIGHT")
+# None where this hardware doesn't have the button
+BUTTONS = tuple(getattr(io, f"BUTTON_{name}", None) for name in NAMES)
+
+# Ring written by the IRQ handlers - preallocated, so they never allocate
+_codes = [0] * QUEUE_SIZE
+_stamps = [0] * QUEUE_SIZE
+_head = 0
+_tail = 0
+_high_since = [None] * len(NAMES)  # ticks each pin last went high, None while low
+_pins = [None] * len(NAMES)
+_irq = False
+
+_home = False
+_home_high_since = None
+_home_pin = None
+
+_presses = {}
+_next_repeat = [None] * len(NAMES)
+_oldest = None  # ticks of the oldest press handled since the last presented()
+
+_hist = [0] * (len(BUCKETS) + 1)
+_count = 0
+_total_ms = 0
+_max_ms = 0
+_last_ms = 0
+
+
+def _handler(index):
+    def edge(pin):
+        global _head
+        now = time.ticks_ms()
+        if pin.value():
+            # Released, or bouncing - restart the settle time
+            _high_since[index] = now
+            return
+        high_since = _high_since[index]
+        _high_since[index] = None
+        if high_since is None or time.ticks_diff(now, high_since) < DEBOUNCE_MS:
+            return
+        nxt = (_head + 1) % QUEUE_SIZE
+        if nxt == _tail:
+            return  # full - update() is far behind, drop the press
+        _codes[_head] = index
+        _stamps[_head] = now
+        _head = nxt
+    return edge
+
+
+def _home_edge(pin):
+    global _home, _home_high_since
+    now = time.ticks_ms()
+    if pin.value():
+        _home_high_since = now
+        return
+    high_since = _home_high_since
+    _home_high_since = None
+    if high_since is not None and time.ticks_diff(now, high_since) >= DEBOUNCE_MS:
+        _home = True
+
+
+def start():
+    """Attach the pin IRQs once - buttons without one fall back to io.pressed"""
+    global _irq, _home_high_since, _home_pin
+    if _irq or machine is None:
+        return _irq
+    try:
+        for index, name in enumerate(NAMES):
+            # Buttons without a pin of their own stay on io.pressed
+            pin = getattr(machine.Pin.board, f"BUTTON_{name}", None)
+            if pin is not None and BUTTONS[index] is not None:
+                if pin.value():
+                    _high_since[index] = time.ticks_add(time.ticks_ms(), -DEBOUNCE_MS)
+                pin.irq(trigger=machine.Pin.IRQ_FALLING | machine.Pin.IRQ_RISING,
+                        handler=_handler(index), hard=True)
+                _pins[index] = pin
+                _irq = True
+        pin = getattr(machine.Pin.board, "BUTTON_HOME", None)
+        if pin is not None:
+            if pin.value():
+                _home_high_since = time.ticks_add(time.ticks_ms(), -DEBOUNCE_MS)
+            pin.irq(trigger=machine.Pin.IRQ_FALLING | machine.Pin.IRQ_RISING,
+                    handler=_home_edge, hard=True)
+            _home_pin = pin
+    except Exception as e:
+        print(f"Button IRQs unavailable: {e}")
+    return _irq
+
+
+def _add(button, stamp, count=1):
+    global _oldest
+    _presses[button] = _presses.get(button, 0) + count
+    if _oldest is None or time.ticks_diff(stamp, _oldest) < 0:
+        _oldest = stamp
+
+
+def take():
+    """Presses since the last call as {io.BUTTON_*: count} - call once per update()"""
+    global _tail
+    _presses.clear()
+    now = time.ticks_ms()
+
+    while _tail != _head:
+        _add(BUTTONS[_codes[_tail]], _stamps[_tail])
+        _tail = (_tail + 1) % QUEUE_SIZE
+
+    for index, name in enumerate(NAMES):
+        button = BUTTONS[index]
+        if button is None:
+            continue
+        if _pins[index] is None and button in io.pressed:
+            _add(button, now)
+        if name not in REPEATING or button not in io.held:
+            _next_repeat[index] = None
+        elif _next_repeat[index] is None:
+            _next_repeat[index] = time.ticks_add(now, REPEAT_DELAY_MS)
+        elif (late := time.ticks_diff(now, _next_repeat[index])) >= 0:
+            # A slow frame owes several repeats - deliver them as one count
+            count = 1 + late // REPEAT_MS
+            _add(button, now, count)
+            _next_repeat[index] = time.ticks_add(now, REPEAT_MS - late % REPEAT_MS)
+
+    return _presses
+
+
+def clear():
+    """Forget queued presses and held repeats - call before starting an app"""
+    global _tail, _oldest
+    _tail = _head
+    _presses.clear()
+    for index in range(len(NAMES)):
+        _next_repeat[index] = None
+    _oldest = None
+
+
+def home():
+    """True once per HOME press - the launcher's cue to end the running app"""
+    global _home
+    if _home_pin is None:
+        return getattr(io, "BUTTON_HOME", None) in io.pressed
+    pressed = _home
+    _home = False
+    return pressed
+
+
+def queued():
+    """Buttons pressed via IRQ and not yet taken, without taking them"""
+    found = set()
+    i = _tail
+    while i != _head:
+        found.add(BUTTONS[_codes[i]])
+        i = (i + 1) % QUEUE_SIZE
+    return found
+
+
+def presented():
+    """Call once display.update() has shown the frame that handled the presses"""
+    global _oldest, _count, _total_ms, _max_ms, _last_ms
+    if _oldest is None:
+        return
+    ms = time.ticks_diff(time.ticks_ms(), _oldest)
+    _oldest = None
+
+    i = 0
+    while i < len(BUCKETS) and ms >= BUCKETS[i]:
+        i += 1
+    _hist[i] += 1
+    _count += 1
+    _total_ms += ms
+    _max_ms = max(_max_ms, ms)
+    _last_ms = ms
+
+
+def last_latency_ms():
+    return _last_ms
+
+
+def stats():
+    """(presses measured, total ms, max ms, histogram)"""
+    return _count, _total_ms, _max_ms, _hist
+
+
+def report():
+    labels = [f"<{b}" for b in BUCKETS] + [f">={BUCKETS[-1]}"]
+    avg = _total_ms // _count if _count else 0
+    hist = " ".join([f"{labels[i]}:{_hist[i]}" for i in range(len(_hist))])
+    print(f"input: {_count} presses, avg {avg}ms, max {_max_ms}ms to photon | {hist} (ms)")
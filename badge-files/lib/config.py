@@ -0,0 +1,71 @@
+# Config Loader
+# Parses /secrets.py once into an immutable record shared by all apps
+# Install to: /lib/config.py (shared by the mods)
+#
+# The result is cached - including "missing or broken" - until reload() is
+# called, so apps can ask for it every frame without touching the
+# filesystem or the import machinery again.
+#
+# GITHUB_USERNAMES = ["octocat", "hubot"] lists profiles for the badge app to
+# rotate through; github_username is then the first of them. A lone
+# GITHUB_USERNAME is a list of one.
+
+import sys
+from collections import namedtuple
+
+Config = namedtuple("Config", ("wifi_ssid", "wifi_password", "github_username", "github_token",
+                               "github_usernames"))
+
+_config = None
+_loaded = False
+
+
+def _parse():
+    sys.path.insert(0, "/")
+    try:
+        import secrets
+    except Exception as e:
+        print(f"Could not load secrets.py: {e}")
+        return None
+    finally:
+        sys.path.pop(0)
+
+    username = getattr(secrets, "GITHUB_USERNAME", None)
+    usernames = tuple(h for h in getattr(secrets, "GITHUB_USERNAMES", None) or () if h)
+    if not usernames and username:
+        usernames = (username,)
+
+    cfg = Config(
+        getattr(secrets, "WIFI_SSID", None),
+        getattr(secrets, "WIFI_PASSWORD", None),
+        usernames[0] if usernames else username,
+        getattr(secrets, "GITHUB_TOKEN", None),
+        usernames,
+    )
+    # The record holds everything we need - let the module be collected
+    del sys.modules["secrets"]
+    return cfg
+
+
+def load():
+    """The parsed secrets.py, or None if it is missing or broken"""
+    global _config, _loaded
+    if not _loaded:
+        _config = _parse()
+        _loaded = True
+    return _config
+
+
+def complete():
+    """The config if it has WiFi details and a GitHub username, else None"""
+    cfg = load()
+    if cfg is None or not cfg.wifi_ssid or not cfg.github_username:
+        return None
+    return cfg
+
+
+def reload():
+    """Forget the cached result - the next load() reads secrets.py again"""
+    global _config, _loaded
+    _config = None
+    _loaded = False
@@ -0,0 +1,169 @@
+# Contribution Stream Parser
+# Fills the contribution grid from JSON bytes as they arrive from the socket
+# Install to: /lib/contribstream.py (shared by the mods)
+#
+# Understands the shape of https://github.com/{user}.contribs:
+#   {"total_contributions": N,
+#    "weeks": [{"contribution_days": [{"level": L, "count": C, ...}, ...]}, ...]}
+# Anything else is skipped; quoted numbers ("level": "3") count as numbers.
+# Keys are matched by a rolling hash and numbers are accumulated in place, so
+# feeding a chunk doesn't allocate.
+
+QUOTE = 34  # "
+BACKSLASH = 92
+COLON = 58
+COMMA = 44
+MINUS = 45
+OPEN_OBJ = 123  # {
+CLOSE_OBJ = 125
+OPEN_ARR = 91  # [
+CLOSE_ARR = 93
+DIGIT_0 = 48
+DIGIT_9 = 57
+
+
+def key_hash(name):
+    h = 0
+    for c in name:
+        h = (h * 31 + c) & 0xFFFFFF
+    # Never 0, which marks "no key"
+    return h | 0x1000000
+
+
+H_TOTAL = key_hash(b"total_contributions")
+H_WEEKS = key_hash(b"weeks")
+H_DAYS = key_hash(b"contribution_days")
+H_LEVEL = key_hash(b"level")
+H_COUNT = key_hash(b"count")
+
+
+class ContribParser:
+    """Incremental parser - call feed() per chunk, read results any time"""
+
+    def __init__(self, grid, weeks, days, levels):
+        self.grid = grid
+        self.weeks = weeks
+        self.days = days
+        self.levels = levels
+
+        self.week = -1
+        self.day = -1
+        self.weeks_done = 0  # fully parsed weeks - safe to draw
+        self.total = None
+        self.computed = 0
+
+        self._stack = []  # key hash of each open container (0 = none)
+        self._key = 0  # key for the next value in the current object
+        self._in_str = False
+        self._esc = False
+        self._hash = 0
+        self._last_str = 0
+        self._str_num = -1  # digits of the current string, -1 before any
+        self._str_ok = False
+        self._in_num = False
+        self._num = 0
+        self._neg = False
+        self._num_ok = True
+
+    def contribs(self):
+        return self.total if self.total else self.computed
+
+    def _context(self):
+        stack = self._stack
+        depth = len(stack)
+        if depth == 5 and stack[1] == H_WEEKS and stack[3] == H_DAYS:
+            return "day"
+        if depth == 1:
+            return "root"
+        return None
+
+    def _value(self, value):
+        key = self._key
+        self._key = 0
+        if value is None:
+            return
+        context = self._context()
+        if context == "day":
+            if key == H_LEVEL:
+                if 0 <= self.week < self.weeks and 0 <= self.day < self.days:
+                    self.grid[self.day * self.weeks + self.week] = value if 0 <= value < self.levels else 0
+            elif key == H_COUNT:
+                self.computed += value
+        elif context == "root" and key == H_TOTAL:
+            self.total = value
+
+    def _end_num(self):
+        self._in_num = False
+        self._value((-self._num if self._neg else self._num) if self._num_ok else None)
+
+    def _open(self):
+        stack = self._stack
+        depth = len(stack)
+        # A new object directly inside "weeks" or "contribution_days"
+        if depth == 2 and stack[1] == H_WEEKS:
+            self.week += 1
+            self.day = -1
+        elif depth == 4 and stack[1] == H_WEEKS and stack[3] == H_DAYS:
+            self.day += 1
+        stack.append(self._key)
+        self._key = 0
+
+    def _close(self):
+        stack = self._stack
+        if stack:
+            stack.pop()
+        # Closed a week object
+        if len(stack) == 2 and stack[1] == H_WEEKS:
+            self.weeks_done = min(self.week + 1, self.weeks)
+
+    def feed(self, buf, length):
+        for i in range(length):
+            c = buf[i]
+
+            if self._in_str:
+                if self._esc:
+                    self._esc = False
+                elif c == BACKSLASH:
+                    self._esc = True
+                elif c == QUOTE:
+                    self._in_str = False
+                    self._last_str = self._hash | 0x1000000
+                    if self._key:
+                        # A quoted value - "3" counts as 3, as int() would read it
+                        self._value(self._str_num if self._str_ok and self._str_num >= 0 else None)
+                    continue
+                if DIGIT_0 <= c <= DIGIT_9:
+                    self._str_num = max(self._str_num, 0) * 10 + c - DIGIT_0
+                else:
+                    self._str_ok = False
+                self._hash = (self._hash * 31 + c) & 0xFFFFFF
+                continue
+
+            if self._in_num:
+                if DIGIT_0 <= c <= DIGIT_9:
+                    self._num = self._num * 10 + c - DIGIT_0
+                    continue
+                if 97 <= c <= 122 or c == 46 or c == 43 or c == 69:
+                    # true/false/null, fractions and exponents - not a level or count
+                    self._num_ok = False
+                    continue
+                self._end_num()
+
+            if c == QUOTE:
+                self._in_str = True
+                self._hash = 0
+                self._str_num = -1
+                self._str_ok = True
+            elif c == COLON:
+                self._key = self._last_str
+            elif c == COMMA:
+                self._key = 0
+            elif c == OPEN_OBJ or c == OPEN_ARR:
+                self._open()
+            elif c == CLOSE_OBJ or c == CLOSE_ARR:
+                self._close()
+            elif DIGIT_0 <= c <= DIGIT_9 or c == MINUS or 97 <= c <= 122:
+                self._in_num = True
+                self._neg = c == MINUS
+                self._num_ok = c < 97  # a letter starts true/false/null
+                self._num = c - DIGIT_0 if DIGIT_0 <= c <= DIGIT_9 else 0
@@ -0,0 +1,116 @@
+# Fade Service
+# Screen fades through the display backlight instead of overdrawing frames
+# Install to: /lib/fade.py (shared by the mods)
+#
+# Dimming the backlight costs nothing per frame. Where the display has no
+# backlight control we fall back to the quantised black overlay from pool,
+# which is only redrawn while a fade is actually running. The launcher fades
+# every app in and calls draw() after each frame; apps only start fade-outs.
+
+import time
+from badgeware import screen, display
+import pool
+
+FADE_IN_MS = 200
+LEVELS = 16  # backlight steps - don't call into the driver every frame
+
+_backlight = None  # the driver's setter, False once probed and missing
+_start = None
+_duration = 0
+_out = False
+_done = True
+_set_level = None
+
+
+def _probe():
+    global _backlight
+    if _backlight is None:
+        _backlight = False
+        for name in ("set_backlight", "backlight"):
+            setter = getattr(display, name, None)
+            if callable(setter):
+                try:
+                    setter(1.0)
+                    _backlight = setter
+                    break
+                except Exception:
+                    pass
+    return _backlight
+
+
+def hardware():
+    """True if fades use the backlight rather than the overlay"""
+    return bool(_probe())
+
+
+def _begin(out, duration_ms):
+    global _start, _duration, _out, _done
+    _start = time.ticks_ms()
+    _duration = max(1, duration_ms)
+    _out = out
+    _done = False
+
+
+def fade_in(duration_ms=FADE_IN_MS):
+    _begin(False, duration_ms)
+
+
+def fade_out(duration_ms=500):
+    _begin(True, duration_ms)
+
+
+def done():
+    """True once the last fade has finished (a fade-out stays dark until reset())"""
+    return _done
+
+
+def level():
+    """Current brightness, 0-255"""
+    if _start is None:
+        return 0 if _out and _done else 255
+    t = min(_duration, time.ticks_diff(time.ticks_ms(), _start))
+    lit = t * 255 // _duration
+    return 255 - lit if _out else lit
+
+
+def _apply(value):
+    global _set_level
+    setter = _probe()
+    if setter:
+        step = value * (LEVELS - 1) // 255
+        if step != _set_level:
+            _set_level = step
+            setter(step / (LEVELS - 1))
+    elif value < 255:
+        screen.brush = pool.fade(255 - value)
+        screen.draw(pool.rect(0, 0, screen.width, screen.height))
+
+
+def draw():
+    """Call after the frame is drawn - applies the fade, if one is running"""
+    global _start, _done
+    if _start is None:
+        if _out and _done:
+            # Faded out - keep the frame dark until reset()
+            _apply(0)
+        return
+
+    value = level()
+    _apply(value)
+    if time.ticks_diff(time.ticks_ms(), _start) >= _duration:
+        _start = None
+        _done = True
+
+
+def reset():
+    """Stop any fade and restore full brightness
+
+    After a fade-out, draw a black frame first - the backlight comes back
+    on over whatever is on screen.
+    """
+    global _start, _out, _done
+    _start = None
+    _out = False
+    _done = True
+    if _probe():
+        _apply(255)
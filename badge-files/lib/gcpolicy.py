@@ -0,0 +1,161 @@
+# GC Policy
+# Moves garbage collection to idle points and measures every pause
+# Install to: /lib/gcpolicy.py (shared by the mods)
+#
+# MicroPython collects automatically once gc.threshold() bytes have been
+# allocated, which usually lands mid-frame or mid-fetch. We learn each app's
+# allocation rate, set the threshold a comfortable number of frames ahead,
+# and collect ourselves at idle points before it is reached. Until a rate has
+# been measured there is no threshold at all - MicroPython's default - so
+# low-allocation apps don't pay for collections we can't yet place.
+#
+# Only the render loop collects. Jobs on the worker's core call the same
+# fetch code, but a collection there would stall the render core mid-frame
+# (and race our counters), so there collect() is deferred to the next frame()
+# and idle() does nothing.
+
+import gc
+import time
+
+try:
+    import _thread
+except ImportError:
+    _thread = None
+
+# Host Python has no MicroPython heap introspection - only measure there
+HAVE_HEAP = hasattr(gc, "mem_alloc") and hasattr(gc, "threshold")
+
+# Pause histogram bucket upper bounds (ms); the last bucket is open-ended
+BUCKETS = (1, 2, 5, 10, 20, 50)
+
+# Aim for a threshold this many frames of allocation ahead
+FRAMES_PER_GC = 30
+MIN_THRESHOLD = 8 * 1024
+MAX_THRESHOLD = 64 * 1024
+RETUNE_EVERY = 30  # frames
+
+_app = None
+_rates = {}  # learned bytes per frame, per app
+_rate = 0
+_threshold = None  # None while unset (gc.threshold(-1))
+_base = 0  # gc.mem_alloc() right after our last collection
+_last_alloc = None
+_frames = 0
+_wanted = False  # a collection deferred from the worker
+# The render loop's thread - the one that imports this, at boot
+_render = _thread.get_ident() if _thread else None
+
+_hist = [0] * (len(BUCKETS) + 1)
+_count = 0
+_auto = 0
+_total_us = 0
+_max_us = 0
+_last_us = 0
+
+
+def _on_worker():
+    return _thread is not None and _thread.get_ident() != _render
+
+
+def collect():
+    """Collect now and record the pause - from the worker, at the next frame()"""
+    global _base, _last_alloc, _count, _total_us, _max_us, _last_us, _wanted
+    if _on_worker():
+        _wanted = True
+        return 0
+    _wanted = False
+    start = time.ticks_us()
+    gc.collect()
+    us = time.ticks_diff(time.ticks_us(), start)
+
+    ms = us // 1000
+    i = 0
+    while i < len(BUCKETS) and ms >= BUCKETS[i]:
+        i += 1
+    _hist[i] += 1
+    _count += 1
+    _total_us += us
+    _max_us = max(_max_us, us)
+    _last_us = us
+
+    if HAVE_HEAP:
+        _base = gc.mem_alloc()
+        _last_alloc = _base
+    return us
+
+
+def idle():
+    """Call at an idle point - collects if an automatic GC is getting close"""
+    if _on_worker():
+        return
+    if HAVE_HEAP and _threshold and gc.mem_alloc() - _base >= _threshold * 3 // 4:
+        collect()
+
+
+def _set_threshold(threshold, force=False):
+    """Set the threshold for a measured rate - or unset it if there is none"""
+    global _threshold
+    if not threshold:
+        if _threshold is not None:
+            _threshold = None
+            gc.threshold(-1)
+        return
+    threshold = max(MIN_THRESHOLD, min(MAX_THRESHOLD, threshold))
+    # Ignore small changes - no point churning the setting
+    if force or _threshold is None or abs(threshold - _threshold) * 4 > _threshold:
+        _threshold = threshold
+        gc.threshold(threshold)
+
+
+def frame():
+    """Call once per frame, just after display.update"""
+    global _last_alloc, _rate, _frames, _auto
+    if _wanted:
+        collect()
+    if not HAVE_HEAP:
+        return
+
+    alloc = gc.mem_alloc()
+    if _last_alloc is not None:
+        if alloc >= _last_alloc:
+            used = alloc - _last_alloc
+            _rate = used if _rate == 0 else (_rate * 7 + used) // 8
+        else:
+            # The heap shrank without us - an automatic collection ran
+            _auto += 1
+    _last_alloc = alloc
+
+    _frames += 1
+    if _frames % RETUNE_EVERY == 0 and _rate:
+        _set_threshold(_rate * FRAMES_PER_GC)
+
+    idle()
+
+
+def start_app(name):
+    """Switch to name's learned allocation rate (call when launching an app)"""
+    global _app, _rate, _frames, _last_alloc
+    if _app is not None and _rate:
+        _rates[_app] = _rate
+    _app = name
+    _rate = _rates.get(name, 0)
+    _frames = 0
+    _last_alloc = None
+    if HAVE_HEAP:
+        _set_threshold(_rate * FRAMES_PER_GC, True)
+
+
+def last_pause_ms():
+    return _last_us // 1000
+
+
+def stats():
+    """(collections, automatic collections seen, total us, max us, histogram)"""
+    return _count, _auto, _total_us, _max_us, _hist
+
+
+def report():
+    labels = [f"<{b}" for b in BUCKETS] + [f">={BUCKETS[-1]}"]
+    avg = _total_us // _count // 1000 if _count else 0
+    hist = " ".join([f"{labels[i]}:{_hist[i]}" for i in range(len(_hist))])
+    print(f"gc: {_count} pauses, {_auto} automatic, avg {avg}ms, max {_max_us // 1000}ms | {hist} (ms)")
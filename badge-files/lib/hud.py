@@ -0,0 +1,109 @@
+# Performance HUD
+# Overlay with frame time, heap, GC pauses, network throughput and input latency
+# Install to: /lib/hud.py (shared by the mods)
+#
+# The launcher calls frame() and draw() around every app's update(), so the
+# HUD works for any app. Hold UP and DOWN together to toggle it. Stats are
+# sampled into a fixed ring and the text is only rebuilt every REFRESH_MS,
+# so the per-frame cost is one rectangle and five text calls.
+
+import gc
+import time
+from badgeware import screen, io
+import assets
+import pool
+import perf
+import gcpolicy
+import buttons
+
+HAVE_HEAP = hasattr(gc, "mem_free")
+
+WINDOW = 32  # frames in the rolling frame-time window
+REFRESH_MS = 250
+
+X, Y = 2, 2
+LINE_H = 8
+
+visible = False
+
+_times = [0] * WINDOW
+_index = 0
+_last_frame = None
+_last_refresh = None
+_lines = ("", "", "", "", "")
+_net_mark = None  # (ticks, perf.net_bytes) at the last refresh
+_net_rate = 0
+
+
+def _chord():
+    held = io.held
+    return (io.BUTTON_UP in held and io.BUTTON_DOWN in held and
+            (io.BUTTON_UP in io.pressed or io.BUTTON_DOWN in io.pressed))
+
+
+def frame():
+    """Call once per frame before the app's update()"""
+    global visible, _index, _last_frame
+    now = time.ticks_ms()
+    if _last_frame is not None:
+        _times[_index] = time.ticks_diff(now, _last_frame)
+        _index = (_index + 1) % WINDOW
+    _last_frame = now
+
+    if _chord():
+        visible = not visible
+
+
+def _refresh(now):
+    global _lines, _net_mark, _net_rate
+
+    avg = sum(_times) // WINDOW
+    worst = max(_times)
+    fps = 1000 // avg if avg else 0
+
+    if HAVE_HEAP:
+        # Counters only - probing for the largest free block would allocate
+        # most of the heap and cause the very pauses the HUD reports
+        heap = f"heap {gc.mem_free() // 1024}k free {gc.mem_alloc() // 1024}k used"
+    else:
+        heap = "heap n/a"
+
+    count, auto, _, max_us, _ = gcpolicy.stats()
+
+    if _net_mark is not None:
+        mark_ticks, mark_bytes = _net_mark
+        elapsed = time.ticks_diff(now, mark_ticks)
+        if elapsed > 0:
+            _net_rate = (perf.net_bytes - mark_bytes) * 1000 // elapsed
+    _net_mark = (now, perf.net_bytes)
+
+    _lines = (
+        f"{avg}ms avg {worst}ms max {fps}fps",
+        heap,
+        f"gc {count}+{auto}auto last {gcpolicy.last_pause_ms()}ms max {max_us // 1000}",
+        f"net {_net_rate // 1024}.{_net_rate % 1024 * 10 // 1024}kB/s",
+        f"input {buttons.last_latency_ms()}ms to photon max {buttons.stats()[2]}",
+    )
+
+
+def draw():
+    """Call after the app's update() - draws the overlay when visible"""
+    global _last_refresh
+    if not visible:
+        return
+
+    now = time.ticks_ms()
+    if _last_refresh is None or time.ticks_diff(now, _last_refresh) >= REFRESH_MS:
+        _refresh(now)
+        _last_refresh = now
+
+    screen.brush = pool.fade(200)
+    screen.draw(pool.rect(0, 0, 160, Y + LINE_H * len(_lines) + 1))
+    font = assets.font(assets.FONT_SMALL)
+    if font:
+        screen.font = font
+    screen.brush = pool.color(0, 255, 0)
+    y = Y
+    for line in _lines:
+        screen.text(line, X, y)
+        y += LINE_H
@@ -0,0 +1,114 @@
+# Virtual List
+# Smooth-scrolling list that only materialises the rows on screen
+# Install to: /lib/listview.py (shared by the mods)
+#
+# A fixed set of row slots is recycled as rows scroll off, so memory and
+# per-frame work depend on the view height, not on how many items there are.
+# The owner supplies bind(row, index) to fill a slot (name, sprite, ...) and
+# draws rows first..last-1 each frame. Letter jumps follow runs of items
+# sharing a first letter, so items should be (mostly) sorted by name.
+
+
+class Row:
+    """A recycled slot - index is the item it currently shows (-1 for none)"""
+
+    def __init__(self):
+        self.index = -1
+        self.name = None
+        self.path = None
+        self.sprite = None
+
+
+class VirtualList:
+    def __init__(self, names, row_h, top, height, bind):
+        self.count = len(names)
+        self.row_h = row_h
+        self.top = top
+        self.height = height
+        self.bind = bind
+        self.selected = 0
+        self.scroll = 0  # pixel offset of the view within the whole list
+        self.first = 0
+        self.last = 0
+        # Enough slots for every row that can be partly visible at once
+        self.rows = [Row() for _ in range(height // row_h + 2)]
+
+        # Start index of each run of items sharing a first letter
+        self.letters = []
+        prev = None
+        for i, name in enumerate(names):
+            letter = name[:1].upper()
+            if letter != prev:
+                self.letters.append(i)
+                prev = letter
+
+        self._place()
+
+    def select(self, index):
+        if self.count:
+            self.selected = index % self.count
+
+    def move(self, delta):
+        """Move the selection by delta items, wrapping at either end"""
+        self.select(self.selected + delta)
+
+    def jump(self, direction):
+        """Select the first item of the next (1) or previous (-1) letter"""
+        if not self.letters:
+            return
+        group = 0
+        for g, start in enumerate(self.letters):
+            if start <= self.selected:
+                group = g
+        if direction < 0 and self.selected > self.letters[group]:
+            # Back to the start of this letter first, like a dictionary
+            self.select(self.letters[group])
+        else:
+            self.select(self.letters[(group + direction) % len(self.letters)])
+
+    def _target(self):
+        y = self.selected * self.row_h
+        if y < self.scroll:
+            return y
+        if y + self.row_h > self.scroll + self.height:
+            return y + self.row_h - self.height
+        return self.scroll
+
+    def _place(self):
+        self.first = self.scroll // self.row_h
+        self.last = min(self.count, (self.scroll + self.height + self.row_h - 1) // self.row_h)
+
+    def update(self):
+        """Ease towards the selection and work out which rows are on screen"""
+        diff = self._target() - self.scroll
+        if diff:
+            step = diff // 3 if abs(diff) >= 3 else diff
+            # Long jumps (wrapping, letter jumps) shouldn't crawl
+            if abs(diff) > self.height * 2:
+                step = diff - (self.height if diff > 0 else -self.height)
+            self.scroll += step
+        self._place()
+
+    def settle(self):
+        """Jump straight to the selection without easing"""
+        self.scroll = self._target()
+        self._place()
+
+    def row(self, index):
+        """The slot showing item index, rebinding a recycled one if needed"""
+        row = self.rows[index % len(self.rows)]
+        if row.index != index:
+            self.bind(row, index)
+            row.index = index
+        return row
+
+    def y(self, index):
+        return self.top + index * self.row_h - self.scroll
+
+    def thumb(self):
+        """(y, h) of a scrollbar thumb over the view"""
+        total = self.count * self.row_h
+        if total <= self.height:
+            return self.top, self.height
+        h = max(6, self.height * self.height // total)
+        return self.top + (self.height - h) * self.scroll // (total - self.height), h
@@ -0,0 +1,65 @@
+# App Usage
+# Remembers how often and how recently each app was launched from the menu
+# Install to: /lib/mru.py (shared by the mods)
+#
+# Recency is counted in launches rather than wall-clock time - the RTC isn't
+# set until WiFi syncs, if it ever does.
+
+import json
+import atomic
+
+MRU_FILE = "/mru.json"
+MAX_APPS = 32
+
+_seq = 0
+_apps = None  # name -> [launch count, seq of the last launch]
+
+
+def _load():
+    global _seq, _apps
+    _apps = {}
+    try:
+        with open(MRU_FILE, "r") as f:
+            state = json.loads(f.read())
+        _seq = state.get("seq", 0)
+        _apps = state.get("apps", {})
+    except Exception:
+        pass
+
+
+def score(name):
+    """Launch count weighted by how many launches ago the app was last used"""
+    if _apps is None:
+        _load()
+    entry = _apps.get(name)
+    if entry is None:
+        return 0
+    count, last = entry
+    return count * 64 // (_seq - last + 4)
+
+
+def record(name):
+    """Count a launch of name and persist it"""
+    global _seq
+    if _apps is None:
+        _load()
+    _seq += 1
+    entry = _apps.get(name)
+    _apps[name] = [(entry[0] if entry else 0) + 1, _seq]
+
+    if len(_apps) > MAX_APPS:
+        del _apps[min(_apps, key=score)]
+
+    atomic.write(MRU_FILE, json.dumps({"seq": _seq, "apps": _apps}), sidecar=False)
+
+
+def order(apps, first):
+    """apps with up to first of the most used moved to the front
+
+    The rest keep their original (alphabetical) order, so the menus' letter
+    jumps still work past the short favourites head.
+    """
+    used = [app for app in apps if score(app[0]) > 0]
+    used.sort(key=lambda app: -score(app[0]))
+    head = used[:first]
+    return head + [app for app in apps if app not in head]
@@ -0,0 +1,37 @@
+# Perf Counters
+# Cheap counters and rate-limited logging shared by the apps and the HUD
+# Install to: /lib/perf.py (shared by the mods)
+
+import time
+import recorder
+
+# Bytes received from the network since boot
+net_bytes = 0
+
+_last_log = {}
+
+
+def add_net_bytes(count):
+    global net_bytes
+    net_bytes += count
+    # Chunk arrival times, when a session trace is being recorded
+    recorder.net(count)
+
+
+def due(key, every_ms=1000):
+    """True at most once per every_ms for each key - check before formatting
+    a message, so the skipped ones cost no allocation"""
+    now = time.ticks_ms()
+    last = _last_log.get(key)
+    if last is not None and time.ticks_diff(now, last) < every_ms:
+        return False
+    _last_log[key] = now
+    return True
+
+
+def log(key, text, every_ms=1000):
+    """print() at most once per every_ms for each key - returns True if printed"""
+    if not due(key, every_ms):
+        return False
+    print(text)
+    return True
@@ -0,0 +1,132 @@
+# Primitive Pool
+# Shared shapes, brushes and matrices so per-frame draws don't allocate
+# Install to: /lib/pool.py (shared by the mods)
+#
+# Every hit is an object the caller would otherwise have built that frame.
+# Pooled shapes are shared by size: each is built at the origin and moved to
+# the position asked for by its own Translation, so a shape that scrolls
+# through every y is still one entry. A transform set by the caller replaces
+# that move and lasts only until the next get of the same shape.
+# Hits are counted per frame (a frame ends when io.ticks moves on) and the
+# emulator prints the average so the saving is visible.
+
+import sys
+from badgeware import shapes, brushes, Matrix, io
+
+# Report on the host emulator, stay quiet on the badge
+REPORT = sys.platform != "rp2"
+REPORT_EVERY = 200  # frames
+
+# Distinct sizes are few; this only guards against runaway keys
+MAX_SHAPES = 96
+
+# Black overlay brushes for fades, alpha quantised to ALPHA_STEPS levels
+ALPHA_STEPS = 16
+
+_shapes = {}
+_brushes = {}
+_fades = [None] * ALPHA_STEPS
+
+_frame_ticks = None
+_frame_saved = 0
+_last_saved = 0
+_frames = 0
+_total_saved = 0
+
+
+def _hit():
+    global _frame_ticks, _frame_saved, _last_saved, _frames, _total_saved
+    if io.ticks != _frame_ticks:
+        if _frame_ticks is not None:
+            _frames += 1
+            _total_saved += _frame_saved
+            _last_saved = _frame_saved
+            if REPORT and _frames % REPORT_EVERY == 0:
+                print(f"pool: {_total_saved // _frames} allocations saved per frame")
+        _frame_ticks = io.ticks
+        _frame_saved = 0
+    _frame_saved += 1
+
+
+def _shape(key, make, x, y):
+    entry = _shapes.get(key)
+    if entry is None:
+        if len(_shapes) >= MAX_SHAPES:
+            _shapes.clear()
+        entry = (make(), Translation())
+        _shapes[key] = entry
+    else:
+        _hit()
+    shape, mover = entry
+    # Also undoes wherever the last caller moved it
+    shape.transform = mover.at(x, y)
+    return shape
+
+
+def rect(x, y, w, h):
+    return _shape(("r", w, h), lambda: shapes.rectangle(0, 0, w, h), x, y)
+
+
+def rounded_rect(x, y, w, h, r):
+    return _shape(("rr", w, h, r), lambda: shapes.rounded_rectangle(0, 0, w, h, r), x, y)
+
+
+def circle(x, y, r):
+    return _shape(("c", r), lambda: shapes.circle(0, 0, r), x, y)
+
+
+def color(r, g, b, a=255):
+    """An interned brush - the same object for the same colour"""
+    key = (r, g, b, a)
+    brush = _brushes.get(key)
+    if brush is None:
+        brush = brushes.color(r, g, b, a)
+        _brushes[key] = brush
+    else:
+        _hit()
+    return brush
+
+
+def fade(alpha):
+    """Black overlay brush for alpha 0-255, from a pre-quantised ramp"""
+    step = max(0, min(255, int(alpha))) * ALPHA_STEPS // 256
+    brush = _fades[step]
+    if brush is None:
+        brush = brushes.color(0, 0, 0, step * 255 // (ALPHA_STEPS - 1))
+        _fades[step] = brush
+    else:
+        _hit()
+    return brush
+
+
+class Translation:
+    """One Matrix moved by deltas instead of rebuilt per draw
+
+    Translations compose exactly, so moving from (x0, y0) to (x1, y1) is a
+    translate by the difference. translate() returns a new Matrix, so only a
+    repeat of the last position is free - and only that counts as a hit.
+    """
+
+    def __init__(self):
+        self.matrix = Matrix()
+        self.x = 0
+        self.y = 0
+
+    def at(self, x, y):
+        if x != self.x or y != self.y:
+            self.matrix = self.matrix.translate(x - self.x, y - self.y)
+            self.x = x
+            self.y = y
+        else:
+            _hit()
+        return self.matrix
+
+
+def stats():
+    """(frames, allocations saved in total, allocations saved last frame)"""
+    return _frames, _total_saved, _last_saved
+
+
+def clear():
+    """Drop pooled shapes (brushes and fades are kept - they are tiny)"""
+    _shapes.clear()
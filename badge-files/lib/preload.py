@@ -0,0 +1,88 @@
+# App Preloader
+# Compiles the app highlighted in the menu ahead of time
+# Install to: /lib/preload.py (shared by the mods)
+#
+# Most of the freeze after pressing B is reading an app's source from flash
+# and compiling it. The menu calls want() on idle frames; the source is read
+# and compiled (on the second core when worker.py can start one) and kept as
+# a code object, one app at a time, only while the heap can spare it. The
+# launcher then runs the code with module() instead of __import__().
+
+import gc
+import sys
+import builtins
+import worker
+
+# Host Python has no MicroPython heap introspection - don't budget there
+HAVE_HEAP = hasattr(gc, "mem_free")
+
+MAX_SOURCE = 48 * 1024  # bigger apps aren't worth the heap
+RESERVE = 64 * 1024  # heap that must stay free after compiling
+
+_path = None  # app the code below belongs to (or is being compiled for)
+_code = None
+
+
+def available():
+    # compile() is optional in MicroPython builds
+    return hasattr(builtins, "compile")
+
+
+def _compile(path):
+    global _code
+    source_file = f"{path}/__init__.py"
+    try:
+        with open(source_file, "r") as f:
+            source = f.read()
+    except OSError:
+        return
+    yield
+
+    if len(source) > MAX_SOURCE or (HAVE_HEAP and gc.mem_free() < RESERVE + len(source) * 4):
+        return
+    code = compile(source, source_file, "exec")
+    del source
+    if HAVE_HEAP and gc.mem_free() < RESERVE:
+        return
+    # Dropped if the menu moved on to another app meanwhile
+    if path == _path:
+        _code = code
+
+
+def want(path):
+    """Start preloading path, dropping whatever was preloaded before"""
+    global _path, _code
+    if path == _path or not available():
+        return
+    _path = path
+    _code = None
+    if worker.start():
+        worker.submit("preload", _compile(path))
+    else:
+        for _ in _compile(path):
+            pass
+
+
+def take(path):
+    """The compiled code for path, if it's ready - hands it over only once"""
+    global _path, _code
+    code = _code if path == _path else None
+    _path = None
+    _code = None
+    return code
+
+
+def module(name, code):
+    """Run preloaded code the way __import__ would have, as a real module
+    registered in sys.modules"""
+    mod = type(sys)(name)
+    mod.__file__ = f"{name}/__init__.py"
+    mod.__path__ = name  # apps are packages
+    # Registered before running, as import does, so the app can import itself
+    sys.modules[name] = mod
+    try:
+        exec(code, mod.__dict__)
+    except:
+        del sys.modules[name]
+        raise
+    return mod
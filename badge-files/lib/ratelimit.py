@@ -0,0 +1,178 @@
+# Rate Limit Scheduler
+# Tracks request quota from response headers and defers requests until it returns
+# Install to: /lib/ratelimit.py (shared by the mods)
+#
+# Many badges behind one conference NAT share GitHub's unauthenticated
+# quota, so hammering the API after a 403 just burns it for everyone.
+# Blocks are kept per host and persisted, so a reset doesn't forget them.
+
+import json
+import time
+import atomic
+
+STATE_FILE = "/ratelimit.json"
+
+DEFAULT_BACKOFF = 60  # s, when we are limited but weren't told for how long
+MAX_BACKOFF = 3600
+RESERVE = 0  # block once X-RateLimit-Remaining drops to this
+
+# Earlier than 2024-01-01 means the clock was never set
+SANE_EPOCH = 1704067200
+
+MONTHS = ("Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec")
+
+
+class Deferred(Exception):
+    """Raised instead of making a request while its host is blocked"""
+
+
+_blocked = {}  # host -> deadline in time.ticks_ms()
+_backoff = {}  # host -> last backoff (s), doubled on repeated failures
+_offset = None  # server time - time.time(), learned from Date headers
+_loaded = False
+
+
+def _host(url):
+    return url.split("/")[2] if "://" in url else url
+
+
+def _int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _header(headers, name):
+    value = headers.get(name)
+    return value if value is not None else headers.get(name.lower())
+
+
+def now_epoch():
+    """Best guess at the current Unix time - None if we have no idea"""
+    if _offset is not None:
+        return time.time() + _offset
+    now = time.time()
+    return now if now >= SANE_EPOCH else None
+
+
+def _note_date(date):
+    # e.g. "Sun, 19 Oct 2026 00:53:00 GMT"
+    global _offset
+    try:
+        _, day, month, year, clock, _ = date.split(" ")
+        h, m, s = clock.split(":")
+        server = time.mktime((int(year), MONTHS.index(month) + 1, int(day), int(h), int(m), int(s), 0, 0))
+        _offset = server - time.time()
+    except Exception:
+        pass
+
+
+def _load():
+    global _loaded
+    _loaded = True
+    try:
+        with open(STATE_FILE, "r") as f:
+            state = json.loads(f.read())
+    except Exception:
+        return
+
+    now = now_epoch()
+    ticks = time.ticks_ms()
+    for host, entry in state.items():
+        until = entry.get("until", 0)
+        _backoff[host] = entry.get("backoff", DEFAULT_BACKOFF)
+        if now is None:
+            # Can't tell how long ago the block was set - wait a default period
+            _blocked[host] = time.ticks_add(ticks, DEFAULT_BACKOFF * 1000)
+        elif until > now:
+            _blocked[host] = time.ticks_add(ticks, int(until - now) * 1000)
+
+
+def _save():
+    now = now_epoch() or 0
+    ticks = time.ticks_ms()
+    state = {}
+    for host, deadline in _blocked.items():
+        state[host] = {
+            "until": now + time.ticks_diff(deadline, ticks) // 1000,
+            "backoff": _backoff.get(host, DEFAULT_BACKOFF),
+        }
+    # The rename alone keeps this safe - a damaged file just fails json.loads
+    atomic.write(STATE_FILE, json.dumps(state), sidecar=False)
+
+
+def block(url, seconds):
+    """Hold off requests to url's host for seconds"""
+    if not _loaded:
+        _load()
+    host = _host(url)
+    seconds = max(1, min(MAX_BACKOFF, int(seconds)))
+    _blocked[host] = time.ticks_add(time.ticks_ms(), seconds * 1000)
+    print(f"Rate limited by {host} - waiting {seconds}s")
+    _save()
+
+
+def failure(url):
+    """A rate-limit error without usable headers - back off exponentially"""
+    host = _host(url)
+    seconds = min(MAX_BACKOFF, _backoff.get(host, DEFAULT_BACKOFF // 2) * 2)
+    _backoff[host] = seconds
+    block(url, seconds)
+
+
+def record(url, response):
+    """Update the quota for url's host from a response's status and headers"""
+    if not _loaded:
+        _load()
+    headers = getattr(response, "headers", None)
+    status = getattr(response, "status", 200)
+    if not headers:
+        if status in (403, 429):
+            failure(url)
+        return
+
+    date = _header(headers, "Date")
+    if date:
+        _note_date(date)
+
+    retry_after = _int(_header(headers, "Retry-After"))
+    remaining = _int(_header(headers, "X-RateLimit-Remaining"))
+    reset = _int(_header(headers, "X-RateLimit-Reset"))
+
+    if retry_after is not None:
+        block(url, retry_after)
+    elif remaining is not None and remaining <= RESERVE:
+        now = now_epoch()
+        block(url, reset - now if reset and now else DEFAULT_BACKOFF)
+    elif status in (403, 429):
+        failure(url)
+    elif _host(url) in _blocked or _host(url) in _backoff:
+        # Quota is back - forget the block and the backoff
+        _blocked.pop(_host(url), None)
+        _backoff.pop(_host(url), None)
+        _save()
+
+
+def wait_s(url):
+    """Seconds until a request to url's host may be made (0 = go ahead)"""
+    if not _loaded:
+        _load()
+    host = _host(url)
+    deadline = _blocked.get(host)
+    if deadline is None:
+        return 0
+    left = time.ticks_diff(deadline, time.ticks_ms())
+    if left <= 0:
+        # Block expired; keep the backoff so a repeat failure waits longer
+        del _blocked[host]
+        _save()
+        return 0
+    return (left + 999) // 1000
+
+
+def check(url):
+    """Raise Deferred if url's host is currently blocked"""
+    wait = wait_s(url)
+    if wait:
+        raise Deferred(f"rate limit: retry in {wait}s")
@@ -0,0 +1,142 @@
+# Session Recorder
+# Records what a real session fed the apps, for replay on the host
+# Install to: /lib/recorder.py (shared by the mods)
+#
+# With RECORD_TRACE set in main.py the launcher calls app() on each launch and
+# frame() before each update(); fetches report requests and every network
+# chunk as it arrives. Records are a few bytes each, buffered in RAM and
+# appended to TRACE_FILE every FLUSH_BYTES, so recording costs one small
+# flash write every few seconds. tools/replay.py feeds a trace back into a
+# mod on the host. Every record starts with its tag and the ms since the
+# previous record (clamped to 65535):
+#
+#   header  MAGIC, version, ticks_ms at start          "<4sBxxxI"
+#   A       app launched       u8 length, path         "<cHB"
+#   F       frame              pressed, held masks     "<cHHH"
+#   U       request started    u8 length, url          "<cHB"
+#   N       network chunk      bytes                   "<cHH"
+#
+# Button masks use bit i for BUTTONS[i].
+
+import struct
+import time
+from badgeware import io
+import buttons
+
+try:
+    import _thread
+except ImportError:
+    _thread = None
+
+MAGIC = b"BTRC"
+VERSION = 1
+TRACE_FILE = "/trace.bin"
+FLUSH_BYTES = 2048
+
+BUTTONS = ("A", "B", "C", "UP", "DOWN", "LEFT", "RIGHT", "HOME")
+_codes = tuple(getattr(io, f"BUTTON_{name}", None) for name in BUTTONS)
+
+# Chunks arrive on the worker core while frames are recorded on this one
+_lock = _thread.allocate_lock() if _thread else None
+_buf = None  # None while not recording
+_last = 0
+
+
+def recording():
+    return _buf is not None
+
+
+def start(keep=False):
+    """Begin a new trace, replacing TRACE_FILE - or with keep, carry on the
+    one already there (after a watchdog reset mid-session)"""
+    global _buf, _last
+    _last = time.ticks_ms()
+    try:
+        if keep:
+            with open(TRACE_FILE, "rb") as f:
+                keep = f.read(4) == MAGIC
+    except OSError:
+        keep = False
+    try:
+        if not keep:
+            with open(TRACE_FILE, "wb") as f:
+                f.write(struct.pack("<4sBxxxI", MAGIC, VERSION, _last))
+    except OSError as e:
+        print(f"Trace disabled: {e}")
+        return False
+    _buf = bytearray()
+    return True
+
+
+def _record(fmt, tag, *values, text=None):
+    global _last
+    if _lock:
+        _lock.acquire()
+    try:
+        now = time.ticks_ms()
+        dt = min(65535, max(0, time.ticks_diff(now, _last)))
+        _last = now
+        _buf.extend(struct.pack(fmt, tag, dt, *values))
+        if text is not None:
+            _buf.extend(text)
+    finally:
+        if _lock:
+            _lock.release()
+
+
+def _mask(buttons_down):
+    mask = 0
+    for i, code in enumerate(_codes):
+        if code is not None and code in buttons_down:
+            mask |= 1 << i
+    return mask
+
+
+def app(path):
+    if _buf is None:
+        return
+    name = path.encode()[:255]
+    _record("<cHB", b"A", len(name), text=name)
+
+
+def frame():
+    """Record this frame's input - call before update()"""
+    if _buf is None:
+        return
+    # IRQ presses the app will take() this frame count as pressed too
+    pressed = _mask(io.pressed) | _mask(buttons.queued())
+    _record("<cHHH", b"F", pressed, _mask(io.held))
+    if len(_buf) >= FLUSH_BYTES:
+        flush()
+
+
+def request(url):
+    if _buf is None:
+        return
+    text = url.encode()[:255]
+    _record("<cHB", b"U", len(text), text=text)
+
+
+def net(count):
+    if _buf is None:
+        return
+    _record("<cHH", b"N", min(count, 65535))
+
+
+def flush():
+    """Append what is buffered to TRACE_FILE"""
+    global _buf
+    if not _buf:
+        return
+    if _lock:
+        _lock.acquire()
+    try:
+        data, _buf = _buf, bytearray()
+    finally:
+        if _lock:
+            _lock.release()
+    try:
+        with open(TRACE_FILE, "ab") as f:
+            f.write(data)
+    except OSError as e:
+        print(f"Trace write failed: {e}")
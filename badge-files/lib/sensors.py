@@ -0,0 +1,67 @@
+# Sensor Service
+# Battery, charging and WiFi state, each sampled at its own rate and cached
+# Install to: /lib/sensors.py (shared by the mods)
+#
+# ADC reads and driver calls are slow next to a frame and their results move
+# over seconds, so apps read the cached value with get() instead. The
+# launcher calls poll() every frame; a source that is due is sampled and, if
+# its value changed, every subscriber is called with (name, value). Apps that
+# subscribe should unsubscribe in on_unload() - see appcache.py.
+
+import time
+from badgeware import get_battery_level, is_charging
+import wifi
+
+# name -> (reader, sample interval in ms)
+SOURCES = {
+    "battery": (get_battery_level, 5000),
+    "charging": (is_charging, 1000),
+    "wifi": (wifi.is_connected, 500),
+}
+
+_values = {}
+_due = {}
+_subscribers = {name: [] for name in SOURCES}
+
+
+def _sample(name, now):
+    reader, interval = SOURCES[name]
+    _due[name] = time.ticks_add(now, interval)
+    try:
+        value = reader()
+    except Exception as e:
+        print(f"Sensor {name} failed: {e}")
+        return
+
+    if name in _values and _values[name] == value:
+        return
+    _values[name] = value
+    for callback in _subscribers[name]:
+        callback(name, value)
+
+
+def poll():
+    """Sample every source that is due - call once per frame"""
+    now = time.ticks_ms()
+    for name in SOURCES:
+        if name not in _due or time.ticks_diff(now, _due[name]) >= 0:
+            _sample(name, now)
+
+
+def get(name):
+    """Latest value of name - sampled now only if it is due"""
+    now = time.ticks_ms()
+    if name not in _due or time.ticks_diff(now, _due[name]) >= 0:
+        _sample(name, now)
+    return _values.get(name)
+
+
+def subscribe(name, callback):
+    """Call callback(name, value) whenever name changes"""
+    if callback not in _subscribers[name]:
+        _subscribers[name].append(callback)
+
+
+def unsubscribe(name, callback):
+    if callback in _subscribers[name]:
+        _subscribers[name].remove(callback)
@@ -0,0 +1,77 @@
+# Suspend Snapshot
+# Saves the last screen's state before deep sleep so waking resumes it
+# Install to: /lib/snapshot.py (shared by the mods)
+#
+# Waking from deep sleep is a cold boot. Before sleeping, deepsleep() asks
+# the app to come back to - the running app, or else the most recent
+# resident one - for its compact render state via suspend(), and writes it
+# with the app path to SNAPSHOT_FILE. On the next boot the launcher take()s
+# the snapshot (it only applies once), launches that app straight away,
+# hands the state to its resume() and leaves WiFi until an app asks for it.
+
+import json
+import atomic
+import appcache
+
+try:
+    import machine
+except ImportError:
+    machine = None
+
+SNAPSHOT_FILE = "/snapshot.json"
+
+_running = None  # (path, module) of the app on screen
+
+
+def running(path, app):
+    """Tell the snapshot which app is on screen (the launcher calls this)"""
+    global _running
+    _running = (path, app) if app is not None else None
+
+
+def capture():
+    """(path, state) for the app to resume, or None if none can suspend"""
+    candidates = []
+    if _running:
+        candidates.append(_running)
+    for path in reversed(appcache.resident()):
+        candidates.append((path, appcache.peek(path)))
+
+    for path, app in candidates:
+        suspend = getattr(app, "suspend", None)
+        if suspend is None:
+            continue
+        try:
+            return path, suspend()
+        except Exception as e:
+            print(f"Suspend failed for {path}: {e}")
+    return None
+
+
+def save():
+    snap = capture()
+    if snap is None:
+        return False
+    path, state = snap
+    return atomic.write(SNAPSHOT_FILE, json.dumps({"app": path, "state": state}))
+
+
+def take():
+    """(path, state) saved before the last deep sleep - removed once read"""
+    data = atomic.read(SNAPSHOT_FILE)
+    atomic.remove(SNAPSHOT_FILE)
+    if data is None:
+        return None
+    try:
+        snap = json.loads(data)
+        return snap["app"], snap.get("state")
+    except Exception as e:
+        print(f"Ignoring snapshot: {e}")
+        return None
+
+
+def deepsleep():
+    """Snapshot the current screen, then enter deep sleep"""
+    save()
+    if machine is not None:
+        machine.deepsleep()
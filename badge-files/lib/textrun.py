@@ -0,0 +1,102 @@
+# Text Run Cache
+# Rasterises static strings once into small images and blits them afterwards
+# Install to: /lib/textrun.py (shared by the mods)
+
+from badgeware import screen, Image
+from collections import OrderedDict
+
+# Pixel budget shared by all cached runs (a full screen is 19200 px)
+DEFAULT_BUDGET = 6000
+# Measured sizes are tiny, but stop runaway growth from dynamic strings
+MAX_SIZES = 128
+
+
+class TextRunCache:
+    """LRU cache of pre-rendered (font, string, brush) text runs"""
+
+    def __init__(self, budget=DEFAULT_BUDGET):
+        self.budget = budget
+        self.used = 0
+        self._runs = OrderedDict()
+        self._sizes = {}
+
+    def measure(self, font, text):
+        """Memoised screen.measure_text - leaves screen.font set to font"""
+        screen.font = font
+        key = (font, text)
+        size = self._sizes.get(key)
+        if size is None:
+            if len(self._sizes) >= MAX_SIZES:
+                self._sizes = {}
+            size = screen.measure_text(text)
+            self._sizes[key] = size
+        return size
+
+    def text(self, font, text, brush, x, y):
+        """Draw text at x, y from the cache, rendering it on first use"""
+        key = (font, text, brush)
+        run = self._runs.pop(key, None)
+        if run is None:
+            run = self._render(font, text, brush)
+            if run is None:
+                # Too big to cache (or render failed) - draw it the slow way
+                screen.font = font
+                screen.brush = brush
+                screen.text(text, x, y)
+                return
+        # Re-insert to mark as most recently used
+        self._runs[key] = run
+        screen.blit(run[0], int(x), int(y))
+
+    def center(self, font, text, brush, cx, y):
+        """Draw text horizontally centred on cx"""
+        w, _ = self.measure(font, text)
+        self.text(font, text, brush, cx - w // 2, y)
+
+    def _render(self, font, text, brush):
+        w, h = self.measure(font, text)
+        w, h = int(w), int(h)
+        pixels = w * h
+        if pixels == 0 or pixels > self.budget:
+            return None
+
+        while self._runs and self.used + pixels > self.budget:
+            oldest = next(iter(self._runs))
+            self.used -= self._runs.pop(oldest)[1]
+
+        try:
+            img = Image(w, h)
+            img.font = font
+            img.brush = brush
+            img.text(text, 0, 0)
+        except Exception as e:
+            print(f"Text run render error: {e}")
+            return None
+
+        self.used += pixels
+        return (img, pixels)
+
+    def clear(self):
+        self._runs = OrderedDict()
+        self._sizes = {}
+        self.used = 0
+
+
+# Shared instance used by the mods
+cache = TextRunCache()
+
+
+def text(font, string, brush, x, y):
+    cache.text(font, string, brush, x, y)
+
+
+def center(font, string, brush, cx, y):
+    cache.center(font, string, brush, cx, y)
+
+
+def measure(font, string):
+    return cache.measure(font, string)
+
+
+def clear():
+    cache.clear()
@@ -0,0 +1,58 @@
+# WiFi Service
+# Started by the launcher so association and DHCP run while apps boot
+# Install to: /lib/wifi.py (shared by the mods)
+#
+# Apps query this instead of owning their own network.WLAN - the interface
+# is a singleton anyway, and calling connect() again would restart an
+# association that is already in progress.
+
+import time
+import network
+import config
+
+WIFI_TIMEOUT = 60  # seconds
+
+_wlan = None
+_started_at = None
+
+
+def start():
+    """Read secrets.py once and begin associating - returns immediately"""
+    global _wlan, _started_at
+
+    if _wlan is not None:
+        return True
+
+    cfg = config.load()
+    if cfg is None or not cfg.wifi_ssid:
+        return False
+
+    try:
+        wlan = network.WLAN(network.STA_IF)
+        wlan.active(True)
+        if not wlan.isconnected():
+            wlan.connect(cfg.wifi_ssid, cfg.wifi_password)
+            print("Connecting to WiFi...")
+    except Exception as e:
+        print(f"WiFi start failed: {e}")
+        return False
+
+    _wlan = wlan
+    _started_at = time.ticks_ms()
+    return True
+
+
+def is_connected():
+    return _wlan is not None and _wlan.isconnected()
+
+
+def timed_out():
+    """True once association has run for WIFI_TIMEOUT without connecting"""
+    if _wlan is None or _wlan.isconnected():
+        return False
+    return time.ticks_diff(time.ticks_ms(), _started_at) > WIFI_TIMEOUT * 1000
+
+
+def wlan():
+    """The shared WLAN interface (None until started)"""
+    return _wlan
@@ -0,0 +1,110 @@
+# Background Worker
+# Runs fetch, parse and decode jobs on the RP2350's second core
+# Install to: /lib/worker.py (shared by the mods)
+#
+# Jobs are the same step generators the apps would otherwise advance once per
+# frame on core 0 - the worker just runs them to completion. Anything a job
+# yields (other than None) and its return value come back through a
+# lock-protected mailbox that the render loop drains with poll(), so drawing
+# never waits on WLAN, flash or parsing. On the host _thread is an ordinary OS
+# thread, so the emulator runs exactly the same code.
+
+import time
+
+try:
+    import _thread
+except ImportError:
+    _thread = None
+
+IDLE_MS = 20
+
+_lock = _thread.allocate_lock() if _thread else None
+_jobs = []
+_mailbox = []
+_generation = 0
+_current = None
+_started = False
+
+
+def available():
+    return _thread is not None
+
+
+def start():
+    """Launch the worker loop once - False if there is no second core to use"""
+    global _started
+    if _started:
+        return True
+    if _thread is None:
+        return False
+    try:
+        _thread.start_new_thread(_loop, ())
+    except Exception as e:
+        print(f"Worker unavailable: {e}")
+        return False
+    _started = True
+    return True
+
+
+def submit(name, job):
+    """Queue a generator - results are posted under name"""
+    with _lock:
+        _jobs.append((_generation, name, job))
+
+
+def poll():
+    """Take every (name, value, error, done) waiting for the render loop"""
+    if not _mailbox:
+        return ()
+    with _lock:
+        items = [item[1:] for item in _mailbox if item[0] == _generation]
+        _mailbox.clear()
+    return items
+
+
+def busy():
+    with _lock:
+        return bool(_jobs) or _current is not None
+
+
+def cancel():
+    """Drop queued jobs and results - a running job stops at its next yield"""
+    global _generation
+    with _lock:
+        _generation += 1
+        _jobs.clear()
+        _mailbox.clear()
+
+
+def _post(gen, name, value, error=None, done=False):
+    with _lock:
+        if gen == _generation:
+            _mailbox.append((gen, name, value, error, done))
+
+
+def _loop():
+    global _current
+    while True:
+        with _lock:
+            if _jobs:
+                gen, name, job = _jobs.pop(0)
+                _current = name
+            else:
+                job = None
+        if job is None:
+            time.sleep_ms(IDLE_MS)
+            continue
+
+        try:
+            while gen == _generation:
+                if (value := next(job)) is not None:
+                    _post(gen, name, value)
+            # Cancelled - let the job's finally blocks tidy up
+            job.close()
+        except StopIteration as result:
+            _post(gen, name, result.value, done=True)
+        except Exception as e:
+            print(f"Worker job {name} failed: {e}")
+            _post(gen, name, None, e, done=True)
+        _current = None
+        del job
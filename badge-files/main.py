@@ -9,6 +9,14 @@ import machine
 import gc
 import powman
 
+# Start associating first thing - it runs in the background while the
+# app boots (needs /lib/wifi.py from badge-files/lib)
+try:
+    import wifi
+    wifi.start()
+except ImportError:
+    pass
+
 # CUSTOMIZATION: Always skip cinematic startup animation
 SKIP_CINEMATIC = True
 
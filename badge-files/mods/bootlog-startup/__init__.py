@@ -5,11 +5,24 @@
 import sys
 import os
 import random
+import time
 
 sys.path.insert(0, "/system/apps/startup")
 os.chdir("/system/apps/startup")
 
-from badgeware import io, screen, run, brushes, shapes, display, PixelFont
+from badgeware import io, screen, run, brushes, shapes, display, Image
+import textrun
+import assets
+import appindex
+import wifi
+import config
+import atomic
+import badgedata
+import fade
+
+# CUSTOMIZATION: Tie each log line to real boot work (fonts, secrets, WiFi,
+# badge cache, app index) instead of cosmetic delays
+REAL_BOOT = True
 
 # Colors
 GREEN = brushes.color(0, 255, 0)
@@ -18,12 +31,10 @@ GRAY = brushes.color(100, 100, 100)
 YELLOW = brushes.color(255, 255, 0)
 CYAN = brushes.color(0, 255, 255)
 BLACK = brushes.color(0, 0, 0)
+RED = brushes.color(255, 60, 60)
 
 # Font
-try:
-    font = PixelFont.load("/system/assets/fonts/ark.ppf")
-except:
-    font = None
+font = assets.font(assets.FONT_SMALL)
 
 # Boot messages
 BOOT_MESSAGES = [
@@ -44,126 +55,258 @@ BOOT_MESSAGES = [
     ("", WHITE, "Press any key..."),
 ]
 
+# Shown after the real boot tasks have finished
+BOOT_FOOTER = BOOT_MESSAGES[-3:]
+
 # State
 current_line = 0
-line_timer = 0
-LINE_DELAY = 150  # ms between lines
-char_index = 0
+line_start = 0  # scheduled start time of the current line
+typed = 0  # glyphs of the current line already drawn
+LINE_PAUSE = 100  # max random pause between lines (ms)
 CHAR_DELAY = 8  # ms between characters (typing effect)
 boot_complete = False
 ticks_start = None
 button_pressed_at = None
 
+# Layout
+LINE_HEIGHT = 10
+MAX_VISIBLE_LINES = 9
+START_Y = 24
+MESSAGE_X = 48
+
 CLEAR = shapes.rectangle(0, 0, screen.width, screen.height)
 
 
-def draw_line(y, status_color, status_text, message, chars=-1):
-    """Draw a single boot log line"""
+def draw_text(text, brush, x, y):
+    """Draw a static string, from the text run cache when a font is loaded"""
     if font:
-        screen.font = font
-    
-    x = 2
-    
-    # Draw status bracket
-    if status_text:
-        screen.brush = status_color
-        if chars == -1 or chars >= len(status_text):
-            screen.text(status_text, x, y)
+        textrun.text(font, text, brush, x, y)
+    else:
+        screen.brush = brush
+        screen.text(text, x, y)
+
+
+def glyph_width(ch):
+    if font:
+        return textrun.measure(font, ch)[0]
+    return screen.measure_text(ch)[0]
+
+
+class Terminal:
+    """Scrolling terminal buffer - one pre-rendered strip per visible row
+
+    Typed glyphs are drawn once into the strip for the current row, so a
+    frame only blits the strips. Scrolling recycles the top strip as the
+    new bottom row instead of redrawing every completed line.
+    """
+
+    def __init__(self, rows, width, line_height):
+        self.line_height = line_height
+        self.strip_clear = shapes.rectangle(0, 0, width, line_height)
+        self.rows = []
+        for _ in range(rows):
+            strip = Image(width, line_height)
+            self._clear(strip)
+            self.rows.append(strip)
+        self.row = 0
+        self.x = 2
+
+    def _clear(self, strip):
+        strip.brush = BLACK
+        strip.draw(self.strip_clear)
+
+    def put(self, ch, brush):
+        """Draw a single glyph at the cursor and advance it"""
+        strip = self.rows[self.row]
+        if font:
+            strip.font = font
+        strip.brush = brush
+        strip.text(ch, self.x, 0)
+        self.x += glyph_width(ch)
+
+    def newline(self):
+        if self.row < len(self.rows) - 1:
+            self.row += 1
         else:
-            screen.text(status_text[:chars], x, y)
-        x = 48
-    
-    # Draw message
-    screen.brush = WHITE
-    msg_chars = chars - len(status_text) if chars != -1 and status_text else chars
-    if msg_chars == -1 or msg_chars >= len(message):
-        screen.text(message, x, y)
-    elif msg_chars > 0:
-        screen.text(message[:msg_chars], x, y)
+            strip = self.rows.pop(0)
+            self._clear(strip)
+            self.rows.append(strip)
+        self.x = 2
+
+    def cursor_y(self, y):
+        return y + self.row * self.line_height
+
+    def draw(self, y):
+        for strip in self.rows:
+            screen.blit(strip, 0, y)
+            y += self.line_height
+
+
+terminal = Terminal(MAX_VISIBLE_LINES, screen.width, LINE_HEIGHT)
+
+# ============================================================================
+# REAL BOOT TASKS - each logs [ OK ]/[FAIL] with how long it took
+# ============================================================================
+def cache_files():
+    """Every cache file of every configured profile"""
+    cfg = config.complete()
+    for handle in cfg.github_usernames if cfg else ():
+        for name in badgedata.PROFILE_FILES + (badgedata.CONTRIB_FILE,):
+            yield badgedata.profile_path(handle, name)
+
+
+def boot_fonts():
+    """Pre-warm the shared font cache for the apps that follow"""
+    return all(assets.font(path) for path in (assets.FONT_SMALL, assets.FONT_LARGE))
+
+
+def boot_secrets():
+    return config.complete() is not None
+
+
+def boot_wifi():
+    """Start associating now - it carries on while the next apps load"""
+    return wifi.start()
+
+
+def boot_cache():
+    """Delete damaged cache files so the badge refetches them cleanly"""
+    valid = False
+    for path in cache_files():
+        try:
+            os.stat(path)
+        except OSError:
+            continue
+        if atomic.valid(path):
+            valid = True
+        else:
+            print(f"Removing damaged cache file {path}")
+            atomic.remove(path)
+    return valid
+
+
+def boot_index():
+    return len(appindex.build()) > 0
+
+
+boot_tasks = [
+    ("Font cache", boot_fonts),
+    ("secrets.py", boot_secrets),
+    ("WiFi connect", boot_wifi),
+    ("Badge cache", boot_cache),
+    ("App index", boot_index),
+] if REAL_BOOT else []
+
+log_lines = [] if REAL_BOOT else list(BOOT_MESSAGES)
+
+
+def run_boot_task():
+    """Run the next task once the log has (nearly) caught up with the work"""
+    if not boot_tasks or len(log_lines) - current_line > 1:
+        return
+
+    label, task = boot_tasks.pop(0)
+    start = time.ticks_ms()
+    try:
+        ok = task()
+    except Exception as e:
+        print(f"Boot task {label} failed: {e}")
+        ok = False
+    elapsed = time.ticks_diff(time.ticks_ms(), start)
+
+    if ok:
+        log_lines.append(("[ OK ]", GREEN, f"{label} {elapsed}ms"))
+    else:
+        log_lines.append(("[FAIL]", RED, f"{label} {elapsed}ms"))
+
+    if not boot_tasks:
+        log_lines.extend(BOOT_FOOTER)
+
+
+def advance(now):
+    """Type every glyph that is due by now - independent of frame rate"""
+    global current_line, line_start, typed, boot_complete
+
+    while current_line < len(log_lines):
+        if now < line_start:
+            return
+
+        status, color, message = log_lines[current_line]
+        status_len = len(status)
+        total = status_len + len(message)
+        due = min(total, (now - line_start) // CHAR_DELAY)
+
+        while typed < due:
+            if typed < status_len:
+                terminal.put(status[typed], color)
+            else:
+                if typed == status_len and status:
+                    terminal.x = MESSAGE_X
+                terminal.put(message[typed - status_len], WHITE)
+            typed += 1
+
+        if typed < total:
+            return
+
+        # Line complete - schedule the next one from when this one was due
+        # to finish, not from the frame that noticed, plus some variation
+        terminal.newline()
+        line_start += total * CHAR_DELAY + random.randint(0, LINE_PAUSE)
+        current_line += 1
+        typed = 0
+
+    if boot_tasks:
+        # Waiting on work - the next line starts typing once it's logged
+        line_start = max(line_start, now)
+        return
+
+    boot_complete = True
 
 
 def update():
-    global current_line, line_timer, char_index, boot_complete, ticks_start, button_pressed_at
+    global ticks_start, line_start, button_pressed_at
 
     if ticks_start is None:
         ticks_start = io.ticks
+        line_start = ticks_start
 
     now = io.ticks
 
+    run_boot_task()
+    advance(now)
+
     # Clear screen
     screen.brush = BLACK
     screen.draw(CLEAR)
 
     # Draw header
-    if font:
-        screen.font = font
-    screen.brush = CYAN
-    screen.text("BADGE BOOT v2.0", 2, 2)
-    screen.brush = GRAY
-    screen.text("----------------", 2, 12)
-
-    # Calculate which lines to show (scroll if needed)
-    line_height = 10
-    max_visible_lines = 9
-    start_y = 24
-    
-    # Draw completed lines
-    visible_start = max(0, current_line - max_visible_lines + 1)
-    
-    for i in range(visible_start, min(current_line, len(BOOT_MESSAGES))):
-        msg = BOOT_MESSAGES[i]
-        y = start_y + (i - visible_start) * line_height
-        if y < 120:
-            draw_line(y, msg[0] and GREEN or CYAN, msg[0], msg[2], -1)
-    
-    # Draw current line with typing effect
-    if current_line < len(BOOT_MESSAGES):
-        msg = BOOT_MESSAGES[current_line]
-        full_text = msg[0] + msg[2]
-        y = start_y + (current_line - visible_start) * line_height
-        
-        if y < 120:
-            draw_line(y, msg[0] and GREEN or CYAN, msg[0], msg[2], char_index)
-        
-        # Advance typing
-        if now - line_timer > CHAR_DELAY:
-            line_timer = now
-            char_index += 1
-            
-            # Line complete
-            if char_index > len(full_text):
-                char_index = 0
-                current_line += 1
-                
-                # Random delay variation for realism
-                line_timer = now + random.randint(0, 100)
-    else:
-        boot_complete = True
+    draw_text("BADGE BOOT v2.0", CYAN, 2, 2)
+    draw_text("----------------", GRAY, 2, 12)
+
+    # Draw the log
+    terminal.draw(START_Y)
 
     # Draw blinking cursor on last line
     if boot_complete and ((now // 500) % 2 == 0):
-        y = start_y + min(current_line - visible_start, max_visible_lines - 1) * line_height
-        screen.brush = GREEN
-        screen.text("_", 2, y)
+        draw_text("_", GREEN, 2, terminal.cursor_y(START_Y))
 
     # Check for button press after boot complete
-    if boot_complete:
+    if boot_complete and not button_pressed_at:
         if io.pressed:
             button_pressed_at = now
+            fade.fade_out(500)
     
     # Fade out and exit
     if button_pressed_at:
-        fade_time = now - button_pressed_at
-        if fade_time < 500:
-            # Fade to black
-            alpha = int((fade_time / 500) * 255)
-            screen.brush = brushes.color(0, 0, 0, alpha)
-            screen.draw(CLEAR)
+        if not fade.done():
+            # Fade to black (backlight, or an overlay without one)
+            fade.draw()
         else:
-            # Exit to menu
+            # Exit to menu - black frame first, then the backlight back up
             screen.brush = BLACK
             screen.draw(CLEAR)
             display.update()
+            fade.reset()
             return False
 
     return None
@@ -9,13 +9,25 @@ import os
 sys.path.insert(0, "/system/apps/badge")
 os.chdir("/system/apps/badge")
 
-from badgeware import io, brushes, shapes, Image, run, PixelFont, screen, Matrix, file_exists
+from badgeware import io, brushes, shapes, Image, run, screen, file_exists
 import random
-import math
-import network
 from urllib.urequest import urlopen
-import gc
 import json
+import textrun
+import assets
+import wifi
+import config
+import animath
+import pool
+import gcpolicy
+import perf
+import badgedata
+import ratelimit
+import contribstream
+import atomic
+import worker
+import sensors
+import recorder
 
 # ============================================================================
 # COLORS - Clean text colors (original layout preserved)
@@ -29,23 +41,30 @@ faded = brushes.color(240, 248, 255, 100)
 # ============================================================================
 # FONTS
 # ============================================================================
-small_font = PixelFont.load("/system/assets/fonts/ark.ppf")
-large_font = PixelFont.load("/system/assets/fonts/absolute.ppf")
+small_font = assets.font(assets.FONT_SMALL)
+large_font = assets.font(assets.FONT_LARGE)
 
 # ============================================================================
 # NETWORK CONFIG
 # ============================================================================
-WIFI_TIMEOUT = 60
 CONTRIB_URL = "https://github.com/{user}.contribs"
 USER_AVATAR = "https://wsrv.nl/?url=https://github.com/{user}.png&w=75&output=png"
 DETAILS_URL = "https://api.github.com/users/{user}"
 
-WIFI_PASSWORD = None
-WIFI_SSID = None
-GITHUB_TOKEN = None
-wlan = None
+# Compact cache of everything shown, written after a successful fetch - one
+# per handle, see badgedata.profile_path()
+
+# With several GITHUB_USERNAMES, show each for this long; the next profile is
+# fetched in the background meanwhile so switching is just a cache read
+ROTATE_MS = 15000
+
+# Parse contributions straight off the socket instead of via contrib_data.json
+STREAM_CONTRIBS = True
+
+# Fetch, parse and decode on the second core; the render loop only draws
+USE_WORKER = True
+
 connected = False
-ticks_start = None
 
 
 def message(text):
@@ -53,102 +72,219 @@ def message(text):
 
 
 def get_connection_details(user):
-    global WIFI_PASSWORD, WIFI_SSID, GITHUB_TOKEN, GITHUB_USERNAME
+    # Parsed once and cached (even when missing) - cheap to call every frame
+    cfg = config.complete()
+    if cfg is None:
+        return False
 
-    if WIFI_SSID is not None and user.handle is not None:
-        return True
+    if user.handle is None:
+        user.handle = current_handle()
+    return True
 
-    try:
-        sys.path.insert(0, "/")
-        try:
-            from secrets import WIFI_PASSWORD, WIFI_SSID, GITHUB_USERNAME, GITHUB_TOKEN
-        finally:
-            try:
-                sys.path.pop(0)
-            except Exception:
-                pass
-    except ImportError:
-        WIFI_PASSWORD = None
-        WIFI_SSID = None
-        GITHUB_USERNAME = None
-        GITHUB_TOKEN = None
-    except Exception:
-        WIFI_PASSWORD = None
-        WIFI_SSID = None
-        GITHUB_USERNAME = None
-        GITHUB_TOKEN = None
 
-    if not WIFI_SSID or not GITHUB_USERNAME:
-        return False
+def profile_handles():
+    cfg = config.complete()
+    return cfg.github_usernames if cfg else ()
 
-    user.handle = GITHUB_USERNAME
-    return True
 
+def current_handle():
+    handles = profile_handles()
+    return handles[profile % len(handles)] if handles else None
 
-def wlan_start():
-    global wlan, ticks_start, connected, WIFI_PASSWORD, WIFI_SSID
 
-    if ticks_start is None:
-        ticks_start = io.ticks
+def wlan_start():
+    global connected
 
     if connected:
+        # Shown from cache - but rotating needs the network for the profiles
+        # that aren't cached yet, even when nothing else started it (deep
+        # sleep resume)
+        if len(profile_handles()) > 1:
+            wifi.start()
         return True
 
-    if wlan is None:
-        wlan = network.WLAN(network.STA_IF)
-        wlan.active(True)
-        
-        if wlan.isconnected():
-            connected = True
-            return True
-        
-        wlan.connect(WIFI_SSID, WIFI_PASSWORD)
-        print("Connecting to WiFi...")
-
-    connected = wlan.isconnected()
-    
-    if io.ticks - ticks_start < WIFI_TIMEOUT * 1000:
-        if connected:
-            print("WiFi connected!")
-            return True
-    elif not connected:
+    # No-op when the launcher has already started associating; False when
+    # there is nothing to associate with (no SSID, or no WLAN interface)
+    if not wifi.start():
         return False
-    
-    return True
+
+    # Cached by the sensor service - no driver call every frame
+    connected = sensors.get("wifi")
+    if connected:
+        print("WiFi connected!")
+        return True
+
+    return not wifi.timed_out()
+
+
+def response_header(response, name):
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    value = headers.get(name)
+    return value if value is not None else headers.get(name.lower())
+
+
+def remove_quietly(path):
+    try:
+        if file_exists(path):
+            os.remove(path)
+    except Exception:
+        pass
+
+
+def resume_point(url, part, meta_file):
+    """(bytes already downloaded, meta) for a partial download of url"""
+    try:
+        with open(meta_file, "r") as f:
+            meta = json.loads(f.read())
+        if meta.get("url") != url or not meta.get("validator"):
+            return 0, None
+        return os.stat(part)[6], meta
+    except Exception:
+        return 0, None
+
+
+def read_cache(path):
+    """Verified contents of a cached file - raises if it is missing or damaged"""
+    data = atomic.read(path)
+    if data is None:
+        raise ValueError(f"{path} is missing or failed verification")
+    return data
+
+
+def open_url(url, extra_headers=None):
+    headers = {"User-Agent": "GitHub Universe Badge 2025"}
+    cfg = config.load()
+    if cfg and cfg.github_token and url.startswith("https://api.github.com"):
+        headers["Authorization"] = f"token {cfg.github_token}"
+    if extra_headers:
+        headers.update(extra_headers)
+
+    recorder.request(url)
+    response = urlopen(url, headers=headers)
+    ratelimit.record(url, response)
+    return response
+
+
+def async_fetch_stream(url, sink, timeout_ms=25000):
+    """Feed a download straight into sink.feed(buf, length) - nothing hits flash"""
+    ratelimit.check(url)
+
+    start_ticks = io.ticks
+    try:
+        response = open_url(url)
+        status = getattr(response, "status", 200)
+        if status != 200:
+            raise RuntimeError(f"HTTP {status}")
+
+        data = bytearray(512)
+        total = 0
+        while True:
+            if timeout_ms is not None and (io.ticks - start_ticks) > timeout_ms:
+                raise TimeoutError(f"Fetch timed out after {timeout_ms} ms at {total} bytes")
+
+            if (length := response.readinto(data)) == 0:
+                break
+            total += length
+            perf.add_net_bytes(length)
+            if perf.due("fetch"):
+                print(f"Streamed {total} bytes")
+            sink.feed(data, length)
+            gcpolicy.idle()
+            yield
+        del data
+        del response
+    except Exception as e:
+        if isinstance(e, TimeoutError):
+            raise
+        raise RuntimeError(f"Stream from {url} failed. {e}") from e
 
 
 def async_fetch_to_disk(url, file, force_update=False, timeout_ms=25000):
-    if not force_update and file_exists(file):
+    # Only a file that matches its recorded length and CRC counts as cached
+    if not force_update and atomic.valid(file):
         return
 
+    # Don't spend quota we know we don't have - raises ratelimit.Deferred
+    ratelimit.check(url)
+
+    # Download into a partial file; its meta (expected length and ETag or
+    # Last-Modified validator) lets a later attempt resume with a Range
+    # request instead of starting from byte zero.
+    #
+    # Resuming needs the response's status and headers. The badge firmware's
+    # urlopen reads and drops them before handing back the socket, so on the
+    # device there is never a validator: no meta is written, a failed
+    # download starts over, and only a urlopen that exposes .status and
+    # .headers (the emulator's) resumes.
+    part = file + ".part"
+    meta_file = part + ".meta"
+    offset, meta = resume_point(url, part, meta_file)
+    badgedata.make_folder(file)
+
     start_ticks = io.ticks
     try:
-        headers = {"User-Agent": "GitHub Universe Badge 2025"}
-        if GITHUB_TOKEN and url.startswith("https://api.github.com"):
-            headers["Authorization"] = f"token {GITHUB_TOKEN}"
+        if offset:
+            response = open_url(url, {"Range": f"bytes={offset}-", "If-Range": meta["validator"]})
+        else:
+            response = open_url(url)
+        status = getattr(response, "status", 200)
+
+        if status == 206 and offset:
+            message(f"Resuming {file} at {offset} bytes")
+            mode = "ab"
+        elif status == 200:
+            # Full body - either a fresh fetch or the validator changed
+            offset = 0
+            mode = "wb"
+            validator = response_header(response, "ETag") or response_header(response, "Last-Modified")
+            length = response_header(response, "Content-Length")
+            if validator:
+                meta = {"url": url, "validator": validator, "length": int(length) if length else None}
+                with open(meta_file, "w") as f:
+                    f.write(json.dumps(meta))
+            else:
+                meta = None
+                remove_quietly(meta_file)
+        else:
+            if status == 416:
+                # Our partial no longer matches anything the server has
+                remove_quietly(part)
+                remove_quietly(meta_file)
+            raise RuntimeError(f"HTTP {status}")
 
-        response = urlopen(url, headers=headers)
         data = bytearray(512)
-        total = 0
-        with open(file, "wb") as f:
+        total = offset
+        with open(part, mode) as f:
             while True:
                 if timeout_ms is not None and (io.ticks - start_ticks) > timeout_ms:
-                    raise TimeoutError(f"Fetch timed out after {timeout_ms} ms")
+                    raise TimeoutError(f"Fetch timed out after {timeout_ms} ms at {total} bytes")
 
                 if (length := response.readinto(data)) == 0:
                     break
                 total += length
-                message(f"Fetched {total} bytes")
+                perf.add_net_bytes(length)
+                if perf.due("fetch"):
+                    print(f"Fetched {total} bytes")
                 f.write(data[:length])
+                # Between chunks is a good moment to pay for a collection
+                gcpolicy.idle()
                 yield
         del data
         del response
+
+        expected = meta.get("length") if meta else None
+        if expected and total != expected:
+            raise RuntimeError(f"Short read: {total} of {expected} bytes")
+
+        # fsync + rename - a reset now leaves the old copy or the new one
+        atomic.commit(part, file)
+        remove_quietly(meta_file)
     except Exception as e:
-        try:
-            if file_exists(file):
-                os.remove(file)
-        except Exception:
-            pass
+        # Keep a resumable partial for the next attempt, drop anything else
+        if not file_exists(meta_file):
+            remove_quietly(part)
         if isinstance(e, TimeoutError):
             raise
         raise RuntimeError(f"Fetch from {url} to {file} failed. {e}") from e
@@ -156,12 +292,31 @@ def async_fetch_to_disk(url, file, force_update=False, timeout_ms=25000):
 
 def get_user_data(user, force_update=False):
     message(f"Getting user data for {user.handle}...")
+    url = DETAILS_URL.format(user=user.handle)
+    path = badgedata.profile_path(user.handle, "user_data.json")
     try:
-        yield from async_fetch_to_disk(DETAILS_URL.format(user=user.handle), "/user_data.json", force_update)
+        yield from async_fetch_to_disk(url, path, force_update)
+    except ratelimit.Deferred as e:
+        # Coalesce: show the cached copy and refresh once quota is back
+        message(f"Deferring user data refresh - {e}")
+        user.deferred = True
+        if not atomic.valid(path):
+            user.failed = True
+            user.name = "Rate Limited"
+            user.handle = user.handle or "Unknown"
+            user.followers = 0
+            user.repos = 0
+            return
     except Exception as e:
         error_msg = str(e).lower()
-        if "403" in error_msg or "rate limit" in error_msg:
+        if "403" in error_msg or "429" in error_msg or "rate limit" in error_msg:
             message("Rate limit exceeded")
+            # Headers (if any) already set the block; this only backs off
+            # further when the server didn't say how long to wait
+            if not ratelimit.wait_s(url):
+                ratelimit.failure(url)
+            user.deferred = True
+            user.failed = True
             user.name = "Rate Limited"
             user.handle = user.handle or "Unknown"
             user.followers = 0
@@ -169,6 +324,7 @@ def get_user_data(user, force_update=False):
             return
         else:
             message(f"Failed to get user data: {e}")
+            user.failed = True
             user.name = "Fetch Error"
             user.handle = user.handle or "Unknown"
             user.followers = 0
@@ -176,47 +332,87 @@ def get_user_data(user, force_update=False):
             return
     
     try:
-        r = json.loads(open("/user_data.json", "r").read())
+        r = json.loads(read_cache(path))
         user.name = r.get("name", user.handle)
         user.handle = r.get("login", "Unknown Handle")
         user.followers = r.get("followers", 0)
         user.repos = r.get("public_repos", 0)
         del r
-        gc.collect()
+        gcpolicy.collect()
     except Exception as e:
         message(f"Failed to parse user data: {e}")
+        atomic.remove(path)
+        user.failed = True
         user.name = "Parse Error"
         user.followers = 0
         user.repos = 0
 
 
+def stream_contrib_data(user, force_update=False):
+    # Streamed contribs are only kept in badge.bin - reuse them from there
+    if not force_update:
+        data = badgedata.load(badgedata.profile_path(user.handle))
+        if data is not None and data.handle.lower() == user.handle.lower():
+            user.contribs = data.contribs
+            user.contribution_data = data.grid
+            return
+
+    message(f"Streaming contribution data for {user.handle}...")
+    user.contribution_data = bytearray(badgedata.GRID_CELLS)
+    parser = contribstream.ContribParser(user.contribution_data, badgedata.WEEKS, badgedata.DAYS, len(User.levels))
+    # User.draw shows each week as soon as the parser has finished it
+    user.contrib_parser = parser
+    try:
+        yield from async_fetch_stream(CONTRIB_URL.format(user=user.handle), parser, timeout_ms=15000)
+    except Exception as e:
+        message(f"Failed to stream contrib data: {e}")
+        user.failed = True
+        user.contribs = 0
+        user.contribution_data = bytearray(badgedata.GRID_CELLS)
+        return
+    finally:
+        user.contrib_parser = None
+
+    user.contribs = parser.contribs()
+
+
 def get_contrib_data(user, force_update=False):
+    if STREAM_CONTRIBS:
+        # Only the compact result reaches flash, via badge.bin
+        yield from stream_contrib_data(user, force_update)
+        return
+
     message(f"Getting contribution data for {user.handle}...")
+    path = badgedata.profile_path(user.handle, badgedata.CONTRIB_FILE)
     try:
-        yield from async_fetch_to_disk(CONTRIB_URL.format(user=user.handle), "/contrib_data.json", force_update, timeout_ms=15000)
+        yield from async_fetch_to_disk(CONTRIB_URL.format(user=user.handle), path, force_update, timeout_ms=15000)
     except TimeoutError as e:
         message(f"Contrib fetch timed out: {e}")
+        user.failed = True
         user.contribs = 0
-        user.contribution_data = [[0 for _ in range(53)] for _ in range(7)]
+        user.contribution_data = bytearray(badgedata.GRID_CELLS)
         return
     except Exception as e:
         message(f"Failed to fetch contrib data: {e}")
+        user.failed = True
         user.contribs = 0
-        user.contribution_data = [[0 for _ in range(53)] for _ in range(7)]
+        user.contribution_data = bytearray(badgedata.GRID_CELLS)
         return
 
     try:
-        r = json.loads(open("/contrib_data.json", "r").read())
+        r = json.loads(read_cache(path))
     except Exception as e:
         message(f"Failed to parse contrib JSON: {e}")
+        atomic.remove(path)
+        user.failed = True
         user.contribs = 0
-        user.contribution_data = [[0 for _ in range(53)] for _ in range(7)]
+        user.contribution_data = bytearray(badgedata.GRID_CELLS)
         return
 
     total = r.get("total_contributions")
     weeks = r.get("weeks") or []
     max_weeks = min(len(weeks), 53)
-    user.contribution_data = [[0 for _ in range(53)] for _ in range(7)]
+    user.contribution_data = bytearray(badgedata.GRID_CELLS)
 
     computed_total = 0
     for w in range(max_weeks):
@@ -232,7 +428,7 @@ def get_contrib_data(user, force_update=False):
                     lvl_index = 0
             except Exception:
                 lvl_index = 0
-            user.contribution_data[d][w] = lvl_index
+            user.contribution_data[d * badgedata.WEEKS + w] = lvl_index
             computed_total += int(count)
 
     if total is None or total == 0:
@@ -240,24 +436,110 @@ def get_contrib_data(user, force_update=False):
     else:
         user.contribs = int(total)
     del r
-    gc.collect()
+    gcpolicy.collect()
 
 
 def get_avatar(user, force_update=False):
     message(f"Getting avatar for {user.handle}...")
-    avatar_path = "/avatar.png"
+    avatar_path = badgedata.profile_path(user.handle, "avatar.png")
     try:
         yield from async_fetch_to_disk(USER_AVATAR.format(user=user.handle), avatar_path, force_update)
-        if file_exists(avatar_path):
+        if atomic.valid(avatar_path):
             user.avatar = Image.load(avatar_path)
         else:
             message("Avatar file not found after download")
+            user.failed = True
             user.avatar = False
     except Exception as e:
         message(f"Failed to get avatar: {e}")
+        user.failed = True
         user.avatar = False
 
 
+def save_badge_data(user):
+    path = badgedata.profile_path(user.handle)
+    if badgedata.save(path, user.name, user.handle, user.followers, user.repos,
+                      user.contribs, user.contribution_data, user.avatar):
+        message(f"Saved {path}")
+
+
+def load_badge_data(user, handle):
+    """Fill user from handle's compact cache - True on a cache hit"""
+    data = badgedata.load(badgedata.profile_path(handle))
+    if data is None:
+        return False
+
+    # Ignore a cache written for a different user
+    if data.handle.lower() != handle.lower():
+        return False
+
+    avatar = data.avatar
+    if avatar is None:
+        # Stored without raw pixels - decode the PNG instead
+        try:
+            avatar = Image.load(badgedata.profile_path(handle, "avatar.png"))
+        except Exception:
+            return False
+
+    user.name = data.name
+    user.handle = data.handle
+    user.followers = data.followers
+    user.repos = data.repos
+    user.contribs = data.contribs
+    user.contribution_data = data.grid
+    user.avatar = avatar
+    return True
+
+
+# Fields the fetch stages fill in - what the worker hands back to the renderer
+FETCH_FIELDS = ("name", "handle", "followers", "repos", "contribs", "contribution_data",
+                "contrib_parser", "avatar", "failed", "deferred")
+
+
+def fetch_snapshot(user):
+    return {key: getattr(user, key) for key in FETCH_FIELDS}
+
+
+def fetch_job(handle, force_update):
+    """All fetch stages, run on the worker against a private User
+
+    Yields its fields when each stage starts (so streamed contribs show up as
+    they arrive) and again when it finishes, and None on every step between,
+    so a cancel stops it within a chunk. The badge cache is written here too,
+    keeping flash writes off the render core.
+    """
+    shadow = User()
+    shadow.handle = handle
+    for stage in (get_user_data, get_contrib_data, get_avatar):
+        started = False
+        for _ in stage(shadow, force_update):
+            if started:
+                yield
+            else:
+                started = True
+                yield fetch_snapshot(shadow)
+        yield fetch_snapshot(shadow)
+
+    if shadow.complete():
+        save_badge_data(shadow)
+
+
+def prefetch_job(handle):
+    """Fetch handle into its cache without showing it - True if it was saved
+
+    Stages yield None, so nothing is posted until the job is done.
+    """
+    shadow = User()
+    shadow.handle = handle
+    for stage in (get_user_data, get_contrib_data, get_avatar):
+        yield from stage(shadow, False)
+
+    if not shadow.complete():
+        return False
+    save_badge_data(shadow)
+    return True
+
+
 def fake_number():
     return random.randint(10000, 99999)
 
@@ -265,14 +547,12 @@ def fake_number():
 def placeholder_if_none(text):
     if text:
         return text
-    old_seed = random.seed()
-    random.seed(int(io.ticks / 100))
-    chars = "!\"£$%^&*()_+-={}[]:@~;'#<>?,./\\|"
-    text = ""
-    for _ in range(20):
-        text += random.choice(chars)
-    random.seed(old_seed)
-    return text
+    # Same scramble for every frame in a 100ms bucket, built once
+    return animath.scramble(io.ticks)
+
+
+# One matrix moved around the contribution graph instead of one per cell
+GRID_MOVER = pool.Translation()
 
 
 class User:
@@ -295,38 +575,95 @@ class User:
         self.contribution_data = None
         self.repos = None
         self.avatar = None
+        self.failed = False
+        self.deferred = False
+        self.contrib_parser = None
         self._task = None
         self._force_update = force_update
 
+    def complete(self):
+        """All data fetched without errors - worth caching"""
+        return (not self.failed and self.handle is not None and self.avatar
+                and self.contribs is not None and self.contribution_data is not None)
+
+    def step_fetch(self):
+        """Advance the fetch by one frame's worth - False if it just failed"""
+        if USE_WORKER and worker.start():
+            return self.poll_worker()
+
+        if not self._task:
+            if not self.name:
+                self._task = get_user_data(self, self._force_update)
+            elif self.contribs is None:
+                self._task = get_contrib_data(self, self._force_update)
+            else:
+                self._task = get_avatar(self, self._force_update)
+
+        try:
+            next(self._task)
+        except StopIteration:
+            self._task = None
+            if self.complete():
+                save_badge_data(self)
+        except:
+            self._task = None
+            return False
+        return True
+
+    def poll_worker(self):
+        """Pick up whatever the worker has fetched since the last frame"""
+        if not self._task:
+            self._task = "fetch"
+            worker.submit("fetch", fetch_job(self.handle, self._force_update))
+
+        # Checked before polling: a job that is neither queued nor running
+        # has either posted its result already or been cancelled
+        lost = not worker.busy()
+        ok = True
+        for name, fields, error, done in worker.poll():
+            if name == "prefetch":
+                prefetch_finished(error is None and fields)
+                continue
+            if fields:
+                for key, value in fields.items():
+                    setattr(self, key, value)
+            if done:
+                self._task = None
+                ok = error is None
+        if lost and self._task:
+            # Cancelled while we were switched out - resubmit next frame
+            self._task = None
+        return ok
+
     def draw_stat(self, title, value, x, y):
         # value may be 0; treat None as missing
         screen.brush = white if value is not None else faded
         screen.font = large_font
         screen.text(str(value) if value is not None else str(fake_number()), x, y)
-        screen.font = small_font
-        screen.brush = phosphor
-        screen.text(title, x - 1, y + 13)
+        textrun.text(small_font, title, phosphor, x - 1, y + 13)
 
     def draw(self, connected):
         # draw contribution graph background
         size = 15
         graph_width = 53 * (size + 2)
-        xo = int(-math.sin(io.ticks / 5000) *
-                 ((graph_width - 160) / 2)) + ((graph_width - 160) / 2)
+        half = (graph_width - 160) // 2
+        xo = half - (animath.sin_ticks(io.ticks, 5000) * half >> animath.Q)
 
         screen.font = small_font
-        rect = shapes.rounded_rectangle(0, 0, size, size, 2)
+        rect = pool.rounded_rect(0, 0, size, size, 2)
+        # While streaming, only weeks the parser has finished are real
+        arrived = self.contrib_parser.weeks_done if self.contrib_parser else badgedata.WEEKS
         for y in range(7):
             for x in range(53):
-                if self.contribution_data:
-                    level = self.contribution_data[y][x]
+                px = x * (size + 2) - xo
+                if px + size < 0 or px > 160:
+                    continue
+                if self.contribution_data and x < arrived:
+                    level = self.contribution_data[y * badgedata.WEEKS + x]
                     screen.brush = User.levels[level]
                 else:
                     screen.brush = User.levels[1]
-                pos = (x * (size + 2) - xo, y * (size + 2) + 1)
-                if pos[0] + size < 0 or pos[0] > 160:
-                    continue
-                rect.transform = Matrix().translate(*pos)
+                rect.transform = GRID_MOVER.at(px, y * (size + 2) + 1)
                 screen.draw(rect)
 
         # draw handle
@@ -336,24 +673,16 @@ class User:
         if ((self.handle is None) or (self.avatar is None) or (self.contribs is None)) and connected:
             if not self.name:
                 handle = "fetching user data..."
-                if not self._task:
-                    self._task = get_user_data(self, self._force_update)
             elif self.contribs is None:
                 handle = "fetching contribs..."
-                if not self._task:
-                    self._task = get_contrib_data(self, self._force_update)
             else:
                 handle = "fetching avatar..."
-                if not self._task:
-                    self._task = get_avatar(self, self._force_update)
 
-            try:
-                next(self._task)
-            except StopIteration:
-                self._task = None
-            except:
-                self._task = None
+            if not self.step_fetch():
                 handle = "fetch error"
+        elif self._task and connected:
+            # Everything is on screen - finish the job so it saves and lets go
+            self.step_fetch()
 
         if not connected:
             handle = "connecting..."
@@ -384,22 +713,151 @@ class User:
                 drawDefaultAvatar()
 
 
+AVATAR_SQUIRCLE = shapes.squircle(0, 0, 10, 5)
+AVATAR_KEYFRAMES = [animath.Keyframes(42, 75, 1 + i / 1.3) for i in range(4)]
+
+
 def drawDefaultAvatar():
-    screen.brush = phosphor
-    squircle = shapes.squircle(0, 0, 10, 5)
-    screen.brush = brushes.color(211, 250, 55, 50)
+    screen.brush = pool.color(211, 250, 55, 50)
+    mul = animath.sin_ticks(io.ticks, 1000) * 14000 >> animath.Q
     for i in range(4):
-        mul = math.sin(io.ticks / 1000) * 14000
-        squircle.transform = Matrix().translate(42, 75).rotate(
-            (io.ticks + i * mul) / 40).scale(1 + i / 1.3)
-        screen.draw(squircle)
+        AVATAR_SQUIRCLE.transform = AVATAR_KEYFRAMES[i].at((io.ticks + i * mul) // 40)
+        screen.draw(AVATAR_SQUIRCLE)
+
+
+# ============================================================================
+# PROFILE ROTATION
+# ============================================================================
+profile = 0             # index into GITHUB_USERNAMES of the profile on screen
+shown_at = io.ticks     # when it went up
+prefetching = None      # handle being fetched into its cache in the background
+prefetch_task = None    # ...and its generator, when there is no worker
+prefetch_tried = set()  # handles not to prefetch again this session
+
+
+def show_profile(index):
+    """Put profile index on screen - straight from its cache when it has one"""
+    global user, profile, shown_at
+    profile = index % len(profile_handles())
+    # Drop the old profile's avatar and grid before reading the next
+    user = User()
+    gcpolicy.collect()
+    user.handle = current_handle()
+    if not load_badge_data(user, user.handle):
+        message(f"No cache for {user.handle} - fetching")
+    shown_at = io.ticks
+
+
+def prefetch_finished(ok):
+    global prefetching, prefetch_task
+    if not ok:
+        message(f"Prefetch of {prefetching} failed")
+    prefetching = None
+    prefetch_task = None
+
+
+def step_prefetch():
+    """Fetch the next profile into its cache while this one is on screen"""
+    global prefetching, prefetch_task
+    if prefetch_task:
+        try:
+            next(prefetch_task)
+        except StopIteration as result:
+            prefetch_finished(result.value)
+        except Exception as e:
+            message(f"Prefetch failed: {e}")
+            prefetch_finished(False)
+        return
+
+    if prefetching:
+        # While the user's fetch runs, poll_worker() picks our result up
+        if not user._task:
+            for name, value, error, done in worker.poll():
+                if name == "prefetch" and done:
+                    prefetch_finished(error is None and value)
+        return
+
+    handles = profile_handles()
+    handle = handles[(profile + 1) % len(handles)]
+    # connected is also true for a profile shown from cache - check the WLAN
+    if not sensors.get("wifi") or user._task or not user.complete() or handle.lower() in prefetch_tried:
+        return
+    # Checked once - verifying the cache reads the whole file
+    prefetch_tried.add(handle.lower())
+    if atomic.valid(badgedata.profile_path(handle)):
+        return
+
+    message(f"Prefetching {handle}...")
+    prefetching = handle
+    if USE_WORKER and worker.start():
+        worker.submit("prefetch", prefetch_job(handle))
+    else:
+        prefetch_task = prefetch_job(handle)
+
+
+def step_rotation():
+    global shown_at
+    if len(profile_handles()) < 2:
+        return
+
+    step_prefetch()
+    if user._task:
+        # Still arriving - give it its full time once it is up
+        shown_at = io.ticks
+    elif not prefetching and io.ticks - shown_at >= ROTATE_MS:
+        # Held while the next profile is prefetched, so the switch is a cache hit
+        index = next_profile()
+        if index == profile:
+            # Offline with nothing else cached - keep this one up
+            shown_at = io.ticks
+        else:
+            show_profile(index)
+
+
+def next_profile():
+    """Index of the profile to rotate to - offline, only ones with a cache"""
+    if sensors.get("wifi"):
+        return profile + 1
+    handles = profile_handles()
+    for step in range(1, len(handles)):
+        if atomic.valid(badgedata.profile_path(handles[(profile + step) % len(handles)])):
+            return profile + step
+    return profile
+
+
+def reset_rotation():
+    """Forget prefetch progress - the worker's queue was just cancelled"""
+    global prefetching, prefetch_task
+    prefetching = None
+    prefetch_task = None
+    prefetch_tried.clear()
 
 
 user = User()
-connected = file_exists("/contrib_data.json") and file_exists("/user_data.json") and file_exists("/avatar.png")
+user.handle = current_handle()
+if user.handle is not None:
+    # Caches from before per-handle directories belong to the first handle
+    badgedata.migrate(profile_handles()[0])
+# Warm boot: one read of badge.bin instead of parsing JSON and decoding PNG.
+# Without it the downloads will do - unless contribs are streamed, as then
+# badge.bin is the only place they are kept
+connected = user.handle is not None and (load_badge_data(user, user.handle) or (not STREAM_CONTRIBS and all(
+    atomic.valid(badgedata.profile_path(user.handle, name))
+    for name in badgedata.PROFILE_FILES[1:] + (badgedata.CONTRIB_FILE,))))
 force_update = False
 
 
+def suspend():
+    """Which profile was up - its data is already in its badge.bin"""
+    return {"profile": profile}
+
+
+def resume(state):
+    index = state.get("profile", 0)
+    if index != profile and index < len(profile_handles()):
+        show_profile(index)
+
+
 def center_text(text, y):
     w, h = screen.measure_text(text)
     screen.text(text, 80 - (w / 2), y)
@@ -447,17 +905,28 @@ def connection_error():
 def update():
     global connected, force_update
 
-    screen.brush = brushes.color(0, 0, 0)
-    screen.draw(shapes.rectangle(0, 0, 160, 120))
+    screen.brush = pool.color(0, 0, 0)
+    screen.draw(pool.rect(0, 0, 160, 120))
 
     force_update = False
 
-    if io.BUTTON_A in io.held and io.BUTTON_C in io.held:
+    # A+C refreshes once, when the second button of the chord goes down -
+    # not on every frame it is held
+    if (io.BUTTON_A in io.held and io.BUTTON_C in io.held
+            and (io.BUTTON_A in io.pressed or io.BUTTON_C in io.pressed)):
         connected = False
+        # Whatever the worker is still fetching belongs to the old config
+        worker.cancel()
+        reset_rotation()
+        config.reload()
+        user.update(True)
+    elif user.deferred and not user._task and not ratelimit.wait_s(DETAILS_URL):
+        # A refresh was held back by the rate limit - quota is available now
         user.update(True)
 
     if get_connection_details(user):
         if wlan_start():
+            step_rotation()
             user.draw(connected)
         else:
             connection_error()
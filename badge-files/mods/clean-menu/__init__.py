@@ -8,8 +8,16 @@ import os
 sys.path.insert(0, "/system/apps/menu")
 os.chdir("/system/apps/menu")
 
-import math
-from badgeware import screen, PixelFont, Image, SpriteSheet, is_dir, file_exists, shapes, brushes, io, run
+from badgeware import screen, is_dir, file_exists, brushes, io, run
+import textrun
+import assets
+import appindex
+import appmenu
+import pool
+import buttons
+import mru
+import preload
+import fade
 
 # ============================================================================
 # CLEAN UI COLOR PALETTE
@@ -29,25 +37,14 @@ class Colors:
 # ============================================================================
 # FONTS
 # ============================================================================
-small_font = PixelFont.load("/system/assets/fonts/ark.ppf")
-large_font = PixelFont.load("/system/assets/fonts/absolute.ppf")
+small_font = assets.font(assets.FONT_SMALL)
+large_font = assets.font(assets.FONT_LARGE)
 
 # ============================================================================
 # APP DISCOVERY
 # ============================================================================
-apps = []
-try:
-    for entry in os.listdir("/system/apps"):
-        app_path = f"/system/apps/{entry}"
-        if is_dir(app_path):
-            has_init = file_exists(f"{app_path}/__init__.py")
-            if has_init and entry not in ("menu", "startup"):
-                apps.append((entry, entry))
-except Exception as e:
-    print(f"Error discovering apps: {e}")
-
-# Sort apps alphabetically for cleaner organization
-apps.sort(key=lambda x: x[0].lower())
+# Shared index, built once per boot and already sorted alphabetically
+apps = appindex.apps()
 
 # ============================================================================
 # LAYOUT CONFIGURATION - Cleaner grid
@@ -56,8 +53,9 @@ apps.sort(key=lambda x: x[0].lower())
 COLS = 3
 ROWS = 2
 APPS_PER_PAGE = COLS * ROWS
-current_page = 0
-total_pages = max(1, math.ceil(len(apps) / APPS_PER_PAGE))
+
+# Most used apps first (a page's worth), the rest alphabetical
+apps = mru.order(apps, APPS_PER_PAGE)
 
 # Grid positioning
 GRID_START_X = 8
@@ -66,8 +64,20 @@ CELL_WIDTH = 50
 CELL_HEIGHT = 44
 ICON_SIZE = 32
 
-active = 0
-alpha = 0
+# CUSTOMIZATION: "grid" pages through 3x2 icons, "list" scrolls through every
+# app (A/C jump between letters), "auto" switches to the list past LIST_AFTER
+VIEW = "auto"
+LIST_AFTER = 2 * APPS_PER_PAGE
+LIST_TOP = 21
+LIST_H = 112 - LIST_TOP
+ROW_H = ICON_SIZE + 4
+
+# Page and selection, in the grid or the list
+menu = appmenu.AppMenu(apps, COLS, ROWS, VIEW, LIST_AFTER, ROW_H, LIST_TOP, LIST_H)
+
+# Idle time on one app before compiling it ahead of the launch
+PRELOAD_IDLE_MS = 300
+last_input = 0
 
 # ============================================================================
 # ICON CLASS - Cleaner version
@@ -85,17 +95,7 @@ class CleanIcon:
         self.x = GRID_START_X + grid_x * CELL_WIDTH + (CELL_WIDTH - ICON_SIZE) // 2
         self.y = GRID_START_Y + grid_y * CELL_HEIGHT
         
-        # Try to load icon
-        try:
-            icon_path = f"/system/apps/{path}/icon.png"
-            if file_exists(icon_path):
-                self.sprite = Image.load(icon_path)
-            else:
-                # Try default icon
-                if file_exists("/system/apps/menu/default_icon.png"):
-                    self.sprite = Image.load("/system/apps/menu/default_icon.png")
-        except Exception as e:
-            print(f"Icon load error for {name}: {e}")
+        self.sprite = appmenu.load_icon(path)
     
     def draw(self, is_active):
         # Background highlight for active item
@@ -105,7 +105,7 @@ class CleanIcon:
         if is_active:
             # Selected state - green highlight
             screen.brush = Colors.BG_SELECTED
-            screen.draw(shapes.rounded_rectangle(bg_x, bg_y, CELL_WIDTH - 4, CELL_HEIGHT, 4))
+            screen.draw(pool.rounded_rect(bg_x, bg_y, CELL_WIDTH - 4, CELL_HEIGHT, 4))
         
         # Draw icon
         if self.sprite:
@@ -117,15 +117,18 @@ class CleanIcon:
             self._draw_placeholder()
     
     def _draw_placeholder(self):
-        """Draw a clean placeholder icon"""
-        screen.brush = Colors.BG_HOVER
-        screen.draw(shapes.rounded_rectangle(self.x, self.y, ICON_SIZE, ICON_SIZE, 4))
-        # Draw first letter of app name
-        screen.font = large_font
-        screen.brush = Colors.TEXT_SECONDARY
-        letter = self.name[0].upper() if self.name else "?"
-        lw, _ = screen.measure_text(letter)
-        screen.text(letter, self.x + (ICON_SIZE - lw) // 2, self.y + 8)
+        draw_placeholder(self.x, self.y, self.name)
+
+def draw_placeholder(x, y, name):
+    """Draw a clean placeholder icon"""
+    screen.brush = Colors.BG_HOVER
+    screen.draw(pool.rounded_rect(x, y, ICON_SIZE, ICON_SIZE, 4))
+    # Draw first letter of app name
+    screen.font = large_font
+    screen.brush = Colors.TEXT_SECONDARY
+    letter = name[0].upper() if name else "?"
+    lw, _ = screen.measure_text(letter)
+    screen.text(letter, x + (ICON_SIZE - lw) // 2, y + 8)
 
 # ============================================================================
 # PAGE LOADING
@@ -148,7 +151,28 @@ def load_page_icons(page):
     
     return icons
 
-icons = load_page_icons(current_page)
+if not menu.listing:
+    icons = load_page_icons(menu.page)
+
+# ============================================================================
+# LIST VIEW - only the rows on screen exist, see appmenu.draw_list
+# ============================================================================
+def draw_row(row, y, is_active):
+    """Draw one list row - the slot already holds its app's name and icon"""
+    if is_active:
+        screen.brush = Colors.BG_SELECTED
+        screen.draw(pool.rounded_rect(4, y + 1, 148, ROW_H - 2, 4))
+
+    if row.sprite:
+        try:
+            screen.blit(row.sprite, 10, y + 2)
+        except:
+            draw_placeholder(10, y + 2, row.name)
+    else:
+        draw_placeholder(10, y + 2, row.name)
+
+    color = Colors.TEXT_PRIMARY if is_active else Colors.TEXT_SECONDARY
+    textrun.text(small_font, row.name, color, 50, y + 14)
 
 # ============================================================================
 # DRAWING FUNCTIONS
@@ -156,20 +180,16 @@ icons = load_page_icons(current_page)
 def draw_header():
     """Draw clean header bar"""
     screen.brush = Colors.BG_CARD
-    screen.draw(shapes.rectangle(0, 0, 160, 20))
+    screen.draw(pool.rect(0, 0, 160, 20))
     
     # Title
-    screen.font = large_font
-    screen.brush = Colors.ACCENT_LIME
-    screen.text("Apps", 6, 3)
+    textrun.text(large_font, "Apps", Colors.ACCENT_LIME, 6, 3)
     
-    # Page indicator (if multiple pages)
-    if total_pages > 1:
-        screen.font = small_font
-        screen.brush = Colors.TEXT_MUTED
-        page_text = f"{current_page + 1}/{total_pages}"
-        pw, _ = screen.measure_text(page_text)
-        screen.text(page_text, 154 - pw, 6)
+    # Position in the list, or page indicator (if multiple pages)
+    pos_text = menu.position()
+    if pos_text:
+        pw, _ = textrun.measure(small_font, pos_text)
+        textrun.text(small_font, pos_text, Colors.TEXT_MUTED, 154 - pw, 6)
 
 def draw_footer(active_name):
     """Draw footer with selected app name"""
@@ -177,14 +197,11 @@ def draw_footer(active_name):
     
     # Background
     screen.brush = Colors.BG_CARD
-    screen.draw(shapes.rectangle(0, footer_y, 160, 8))
+    screen.draw(pool.rect(0, footer_y, 160, 8))
     
     # App name centered
-    screen.font = small_font
-    screen.brush = Colors.TEXT_PRIMARY
     if active_name:
-        nw, _ = screen.measure_text(active_name)
-        screen.text(active_name, 80 - nw // 2, footer_y)
+        textrun.center(small_font, active_name, Colors.TEXT_PRIMARY, 80, footer_y)
 
 def draw_nav_hints():
     """Draw subtle navigation hints"""
@@ -192,82 +209,78 @@ def draw_nav_hints():
     screen.brush = Colors.TEXT_MUTED
     
     # Left/Right arrows for paging (if multiple pages)
-    if total_pages > 1:
-        if current_page > 0:
+    if menu.pages > 1 and not menu.listing:
+        if menu.page > 0:
             screen.text("<", 2, 55)
-        if current_page < total_pages - 1:
+        if menu.page < menu.pages - 1:
             screen.text(">", 152, 55)
 
+# ============================================================================
+# SUSPEND / RESUME - see snapshot.py
+# ============================================================================
+def suspend():
+    """Where the menu was, for snapshot.deepsleep()"""
+    return menu.suspend()
+
+def resume(state):
+    """Come back from deep sleep on the same page and app"""
+    global icons
+    if menu.resume(state):
+        icons = load_page_icons(menu.page)
+
 # ============================================================================
 # MAIN UPDATE LOOP
 # ============================================================================
 def update():
-    global active, icons, alpha, current_page, total_pages
+    global icons, last_input
 
-    # Navigation input
-    if io.BUTTON_C in io.pressed:  # Right
-        active += 1
-    if io.BUTTON_A in io.pressed:  # Left
-        active -= 1
-    if io.BUTTON_UP in io.pressed:
-        active -= COLS
-    if io.BUTTON_DOWN in io.pressed:
-        active += COLS
-    
-    # Handle page wrapping
-    if active >= len(icons):
-        if current_page < total_pages - 1:
-            current_page += 1
-            icons = load_page_icons(current_page)
-            active = 0
-        else:
-            current_page = 0
-            icons = load_page_icons(current_page)
-            active = 0
-    elif active < 0:
-        if current_page > 0:
-            current_page -= 1
-            icons = load_page_icons(current_page)
-            active = len(icons) - 1
-        else:
-            current_page = total_pages - 1
-            icons = load_page_icons(current_page)
-            active = len(icons) - 1
+    presses = buttons.take()
+    # Navigation input - queued presses all count, the page loads once
+    if menu.navigate(presses):
+        icons = load_page_icons(menu.page)
+    app_idx = menu.selected()
+
+    # Compile the highlighted app while the user is looking at it
+    if presses:
+        last_input = io.ticks
+    elif fade.done() and io.ticks - last_input >= PRELOAD_IDLE_MS and app_idx < len(apps):
+        preload.want(f"/system/apps/{apps[app_idx][1]}")
     
     # Launch app on B press
-    if io.BUTTON_B in io.pressed:
-        app_idx = current_page * APPS_PER_PAGE + active
+    if presses.get(io.BUTTON_B):
         if app_idx < len(apps):
             app_path = f"/system/apps/{apps[app_idx][1]}"
             if is_dir(app_path) and file_exists(f"{app_path}/__init__.py"):
+                mru.record(apps[app_idx][0])
                 return app_path
     
     # === DRAW UI ===
     
     # Background
     screen.brush = Colors.BG_DARK
-    screen.draw(shapes.rectangle(0, 0, 160, 120))
-    
-    # Header
-    draw_header()
+    screen.draw(pool.rect(0, 0, 160, 120))
     
-    # Draw icons
-    for i, icon in enumerate(icons):
-        icon.draw(i == active)
+    if menu.listing:
+        # Only the rows on screen - the header and footer cover the overflow
+        menu.draw_list(draw_row, 155, Colors.BORDER, Colors.ACCENT_LIME)
+        draw_header()
+        active_name = apps[app_idx][0] if apps else ""
+    else:
+        # Header
+        draw_header()
+        
+        # Draw icons
+        for i, icon in enumerate(icons):
+            icon.draw(i == menu.active)
+        
+        active_name = icons[menu.active].name if icons and menu.active < len(icons) else ""
     
     # Footer with active app name
-    active_name = icons[active].name if icons and active < len(icons) else ""
     draw_footer(active_name)
     
     # Navigation hints
     draw_nav_hints()
     
-    # Fade in effect
-    if alpha < 255:
-        screen.brush = brushes.color(0, 0, 0, 255 - alpha)
-        screen.draw(shapes.rectangle(0, 0, 160, 120))
-        alpha = min(255, alpha + 30)
-    
     return None
 
 if __name__ == "__main__":
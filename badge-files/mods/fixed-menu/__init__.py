@@ -4,14 +4,23 @@
 
 import sys
 import os
-import math
 
 sys.path.insert(0, "/system/apps/menu")
 os.chdir("/system/apps/menu")
 
-from badgeware import screen, PixelFont, Image, is_dir, file_exists, shapes, brushes, io, run, get_battery_level, is_charging, display
-import machine
+from badgeware import screen, is_dir, file_exists, brushes, io, run, display
 import time
+import textrun
+import assets
+import appindex
+import appmenu
+import pool
+import buttons
+import snapshot
+import mru
+import preload
+import fade
+import sensors
 
 # Colors
 BLACK = brushes.color(0, 0, 0)
@@ -21,28 +30,19 @@ TEXT_DIM = brushes.color(150, 180, 50)
 SELECTED_BG = brushes.color(50, 60, 50)
 
 # Font
-font = PixelFont.load("/system/assets/fonts/ark.ppf")
+font = assets.font(assets.FONT_SMALL)
 screen.font = font
 
-# Discover apps
-apps = []
-try:
-    for entry in os.listdir("/system/apps"):
-        app_path = f"/system/apps/{entry}"
-        if is_dir(app_path) and file_exists(f"{app_path}/__init__.py"):
-            if entry not in ("menu", "startup"):
-                apps.append((entry, entry))
-except Exception as e:
-    print(f"Error: {e}")
-
-apps.sort(key=lambda x: x[0].lower())
+# Discover apps (shared index, built once per boot)
+apps = appindex.apps()
 
 # Layout: 3 columns x 2 rows = 6 per page
 COLS = 3
 ROWS = 2
 APPS_PER_PAGE = COLS * ROWS
-current_page = 0
-total_pages = max(1, math.ceil(len(apps) / APPS_PER_PAGE))
+
+# Most used apps first (a page's worth), the rest alphabetical
+apps = mru.order(apps, APPS_PER_PAGE)
 
 # Grid dimensions - leave room for header (18px) and footer (16px)
 HEADER_H = 18
@@ -52,17 +52,28 @@ CELL_W = 160 // COLS  # ~53px
 CELL_H = GRID_H // ROWS  # ~43px
 ICON_SIZE = 32
 
-active = 0
-alpha = 0
+# CUSTOMIZATION: "grid" pages through 3x2 icons, "list" scrolls through every
+# app (A/C jump between letters), "auto" switches to the list past LIST_AFTER
+VIEW = "auto"
+LIST_AFTER = 2 * APPS_PER_PAGE
+ROW_H = ICON_SIZE + 4
+
+# Page and selection, in the grid or the list
+menu = appmenu.AppMenu(apps, COLS, ROWS, VIEW, LIST_AFTER, ROW_H, HEADER_H, GRID_H)
+
+# Idle time on one app before compiling it ahead of the launch
+PRELOAD_IDLE_MS = 300
+last_input = 0
 
 # Load icons for current page
 icons = []
 icon_sprites = {}
 
+
 def load_page():
     global icons, icon_sprites
     icons = []
-    start = current_page * APPS_PER_PAGE
+    start = menu.page * APPS_PER_PAGE
     end = min(start + APPS_PER_PAGE, len(apps))
     
     for i in range(start, end):
@@ -78,16 +89,7 @@ def load_page():
         
         # Load sprite if not cached
         if path not in icon_sprites:
-            try:
-                icon_path = f"/system/apps/{path}/icon.png"
-                if file_exists(icon_path):
-                    icon_sprites[path] = Image.load(icon_path)
-                elif file_exists("/system/apps/menu/default_icon.png"):
-                    icon_sprites[path] = Image.load("/system/apps/menu/default_icon.png")
-                else:
-                    icon_sprites[path] = None
-            except:
-                icon_sprites[path] = None
+            icon_sprites[path] = appmenu.load_icon(path)
         
         icons.append({
             'name': name,
@@ -97,66 +99,96 @@ def load_page():
             'sprite': icon_sprites.get(path)
         })
 
-load_page()
+if not menu.listing:
+    load_page()
+
+
+# Battery gauge - only recomputed when the sensor service reports a change
+battery_w = 0
+charging = False
+
+
+def on_power(name, value):
+    global battery_w, charging
+    if name == "battery":
+        battery_w = int(14 * (value or 0) / 100)
+    else:
+        charging = bool(value)
+
+
+for source in ("battery", "charging"):
+    sensors.subscribe(source, on_power)
+    on_power(source, sensors.get(source))
+
+
+def on_unload():
+    """Called by the launcher's app cache when this module is dropped"""
+    for source in ("battery", "charging"):
+        sensors.unsubscribe(source, on_power)
+
+
+def suspend():
+    """Where the menu was, for snapshot.deepsleep()"""
+    return menu.suspend()
+
+
+def resume(state):
+    """Come back from deep sleep on the same page and app"""
+    if menu.resume(state):
+        load_page()
 
 
 def draw_header():
     # Background bar
-    screen.brush = brushes.color(25, 30, 27)
-    screen.draw(shapes.rectangle(0, 0, 160, HEADER_H))
+    screen.brush = pool.color(25, 30, 27)
+    screen.draw(pool.rect(0, 0, 160, HEADER_H))
     
     # Title
-    screen.brush = PHOSPHOR
-    screen.text("Apps", 5, 3)
+    textrun.text(font, "Apps", PHOSPHOR, 5, 3)
     
     # Battery
-    batt = get_battery_level() if not is_charging() else int((io.ticks / 20) % 100)
     bx, by = 135, 4
     screen.brush = PHOSPHOR
-    screen.draw(shapes.rectangle(bx, by, 18, 10))
-    screen.draw(shapes.rectangle(bx + 18, by + 3, 2, 4))
+    screen.draw(pool.rect(bx, by, 18, 10))
+    screen.draw(pool.rect(bx + 18, by + 3, 2, 4))
     screen.brush = BG
-    screen.draw(shapes.rectangle(bx + 1, by + 1, 16, 8))
+    screen.draw(pool.rect(bx + 1, by + 1, 16, 8))
     screen.brush = PHOSPHOR
-    bw = int(14 * batt / 100)
-    screen.draw(shapes.rectangle(bx + 2, by + 2, bw, 6))
+    bw = int(14 * ((io.ticks / 20) % 100) / 100) if charging else battery_w
+    screen.draw(pool.rect(bx + 2, by + 2, bw, 6))
     
-    # Page indicator
-    if total_pages > 1:
-        screen.brush = TEXT_DIM
-        ptxt = f"{current_page+1}/{total_pages}"
-        pw, _ = screen.measure_text(ptxt)
-        screen.text(ptxt, 130 - pw, 3)
+    # Position in the list, or page indicator
+    ptxt = menu.position()
+    if ptxt:
+        pw, _ = textrun.measure(font, ptxt)
+        textrun.text(font, ptxt, TEXT_DIM, 130 - pw, 3)
 
 
 def draw_footer(name):
     # Background
     fy = 120 - FOOTER_H
-    screen.brush = brushes.color(25, 30, 27)
-    screen.draw(shapes.rectangle(0, fy, 160, FOOTER_H))
+    screen.brush = pool.color(25, 30, 27)
+    screen.draw(pool.rect(0, fy, 160, FOOTER_H))
     
     # Selected app name - centered
     if name:
-        screen.brush = PHOSPHOR
-        nw, _ = screen.measure_text(name)
-        screen.text(name, 80 - nw // 2, fy + 3)
+        textrun.center(font, name, PHOSPHOR, 80, fy + 3)
     
     # Hint
-    screen.brush = TEXT_DIM
-    screen.text("A+C:off", 115, fy + 3)
+    textrun.text(font, "A+C:off", TEXT_DIM, 115, fy + 3)
 
 
 def draw_icons():
     for i, icon in enumerate(icons):
-        is_active = (i == active)
+        is_active = (i == menu.active)
         x, y = icon['x'], icon['y']
         
         # Selection highlight
         if is_active:
             screen.brush = SELECTED_BG
-            screen.draw(shapes.rounded_rectangle(x - 4, y - 4, ICON_SIZE + 8, ICON_SIZE + 8, 6))
+            screen.draw(pool.rounded_rect(x - 4, y - 4, ICON_SIZE + 8, ICON_SIZE + 8, 6))
             screen.brush = PHOSPHOR
-            screen.draw(shapes.rounded_rectangle(x - 2, y - 2, ICON_SIZE + 4, ICON_SIZE + 4, 4))
+            screen.draw(pool.rounded_rect(x - 2, y - 2, ICON_SIZE + 4, ICON_SIZE + 4, 4))
         
         # Icon sprite
         if icon['sprite']:
@@ -169,9 +201,27 @@ def draw_icons():
             draw_placeholder(x, y, icon['name'], is_active)
 
 
+def draw_row(row, y, is_active):
+    """Draw one list row for appmenu.draw_list - the slot holds its app already"""
+    if is_active:
+        screen.brush = SELECTED_BG
+        screen.draw(pool.rounded_rect(2, y + 1, 150, ROW_H - 2, 6))
+
+    if row.sprite:
+        row.sprite.alpha = 255 if is_active else 120
+        try:
+            screen.blit(row.sprite, 8, y + 2)
+        except:
+            draw_placeholder(8, y + 2, row.name, is_active)
+    else:
+        draw_placeholder(8, y + 2, row.name, is_active)
+
+    textrun.text(font, row.name, PHOSPHOR if is_active else TEXT_DIM, 48, y + 14)
+
+
 def draw_placeholder(x, y, name, is_active):
     screen.brush = PHOSPHOR if is_active else TEXT_DIM
-    screen.draw(shapes.rounded_rectangle(x, y, ICON_SIZE, ICON_SIZE, 4))
+    screen.draw(pool.rounded_rect(x, y, ICON_SIZE, ICON_SIZE, 4))
     screen.brush = BLACK
     letter = name[0].upper() if name else "?"
     lw, _ = screen.measure_text(letter)
@@ -179,75 +229,57 @@ def draw_placeholder(x, y, name, is_active):
 
 
 def update():
-    global active, current_page, alpha
+    global last_input
     
     # Power off: hold A+C together
     if io.BUTTON_A in io.held and io.BUTTON_C in io.held:
         # Show power off message
         screen.brush = BLACK
-        screen.draw(shapes.rectangle(0, 0, 160, 120))
+        screen.draw(pool.rect(0, 0, 160, 120))
         screen.brush = PHOSPHOR
         screen.text("Powering off...", 35, 50)
         screen.brush = TEXT_DIM
         screen.text("Press RESET to wake", 25, 70)
         display.update()
         time.sleep(1)
-        machine.deepsleep()
+        # Saves the screen to come back to, then sleeps
+        snapshot.deepsleep()
     
-    # Navigation
-    if io.BUTTON_C in io.pressed:
-        active += 1
-    if io.BUTTON_A in io.pressed:
-        active -= 1
-    if io.BUTTON_UP in io.pressed:
-        active -= COLS
-    if io.BUTTON_DOWN in io.pressed:
-        active += COLS
-    
-    # Page wrapping
-    if active >= len(icons):
-        if current_page < total_pages - 1:
-            current_page += 1
-            load_page()
-            active = 0
-        else:
-            current_page = 0
-            load_page()
-            active = 0
-    elif active < 0:
-        if current_page > 0:
-            current_page -= 1
-            load_page()
-            active = len(icons) - 1
-        else:
-            current_page = total_pages - 1
-            load_page()
-            active = len(icons) - 1
+    presses = buttons.take()
+    # Navigation - every queued press counts, but the page loads only once
+    if menu.navigate(presses):
+        load_page()
+    app_idx = menu.selected()
+
+    # Compile the highlighted app while the user is looking at it
+    if presses:
+        last_input = io.ticks
+    elif fade.done() and io.ticks - last_input >= PRELOAD_IDLE_MS and app_idx < len(apps):
+        preload.want(f"/system/apps/{apps[app_idx][1]}")
     
     # Launch app
-    if io.BUTTON_B in io.pressed and icons:
-        app_idx = current_page * APPS_PER_PAGE + active
+    if presses.get(io.BUTTON_B) and apps:
         if app_idx < len(apps):
             path = f"/system/apps/{apps[app_idx][1]}"
             if is_dir(path) and file_exists(f"{path}/__init__.py"):
+                mru.record(apps[app_idx][0])
                 return path
     
     # Draw
     screen.brush = BG
-    screen.draw(shapes.rectangle(0, 0, 160, 120))
+    screen.draw(pool.rect(0, 0, 160, 120))
     
-    draw_header()
-    draw_icons()
-    
-    name = icons[active]['name'] if icons and active < len(icons) else ""
+    if menu.listing:
+        # Only the rows on screen - the header and footer cover the overflow
+        menu.draw_list(draw_row, 156, SELECTED_BG, TEXT_DIM)
+        draw_header()
+        name = apps[app_idx][0] if apps else ""
+    else:
+        draw_header()
+        draw_icons()
+        name = icons[menu.active]['name'] if icons and menu.active < len(icons) else ""
     draw_footer(name)
     
-    # Fade in
-    if alpha < 255:
-        screen.brush = brushes.color(0, 0, 0, 255 - alpha)
-        screen.draw(shapes.rectangle(0, 0, 160, 120))
-        alpha = min(255, alpha + 40)
-    
     return None
 
 
@@ -3,44 +3,85 @@
 
 import sys
 import os
-from badgeware import run, io
-import machine
-import gc
+from badgeware import run
 import powman
+import textrun
+import pool
+import gcpolicy
+import wifi
+import worker
+import buttons
+import preload
+import appcache
+import snapshot
+import assetpack
+import recorder
+import appframe
 
-running_app = None
+# Record input and network timing to /trace.bin for tools/replay.py
+RECORD_TRACE = False
 
-# Check if this is a HOME button reset (watchdog wake) vs fresh boot
-IS_HOME_RESET = powman.get_wake_reason() == powman.WAKE_WATCHDOG
+# Check if this is a watchdog reset vs fresh boot
+IS_WATCHDOG_RESET = powman.get_wake_reason() == powman.WAKE_WATCHDOG
 
+# Waking from deep sleep: (app, state) saved by snapshot.deepsleep(), if any
+RESUME = None if IS_WATCHDOG_RESET else snapshot.take()
 
-def quit_to_launcher(pin):
-    global running_app
-    getattr(running_app, "on_exit", lambda: None)()
-    while not pin.value():
-        pass
-    machine.reset()
+# Start associating first thing - it runs in the background while the
+# first app imports and loads its fonts and data. A resumed screen needs
+# nothing from the network, so leave it until an app asks.
+if RESUME is None:
+    wifi.start()
+
+# Fonts and icons from one read-only pack - copied into the XIP-mapped ROM
+# segment once (after a new /assets.bin), then read in place by every app
+assetpack.install()
+assetpack.mount()
+
+if RECORD_TRACE:
+    # Reset mid-session by the watchdog - keep appending to the same session
+    recorder.start(keep=IS_WATCHDOG_RESET)
 
+# Timestamped button presses from pin IRQs - nothing is lost to a slow frame.
+# HOME ends the running app at its next frame (see appframe.py), so it comes
+# back through launch_app's cleanup below instead of resetting the badge.
+buttons.start()
+
+running_app = None
 
-# Setup home button handler
-machine.Pin.board.BUTTON_HOME.irq(
-    trigger=machine.Pin.IRQ_FALLING, handler=quit_to_launcher
-)
 
+def launch_app(app_path, state=None):
+    """Launch an app and return what it wants to launch next
 
-def launch_app(app_path):
-    """Launch an app and return what it wants to launch next"""
+    state is a snapshot from before deep sleep, handed to the app's resume().
+    """
     global running_app
     
     sys.path.insert(0, app_path)
     os.chdir(app_path)
     
-    running_app = __import__(app_path)
+    # The menu may already have compiled the app it was highlighting
+    code = preload.take(app_path)
+    
+    # A resident app carries on where it left off - no import, no init()
+    running_app = appcache.get(app_path)
+    if running_app is None:
+        # Unload old apps first if the heap can't take another one
+        appcache.trim()
+        running_app = preload.module(app_path, code) if code else __import__(app_path)
+        getattr(running_app, "init", lambda: None)()
+    del code
+    if state is not None:
+        getattr(running_app, "resume", lambda state: None)(state)
+    # Lets snapshot.deepsleep() ask this app for its state
+    snapshot.running(app_path, running_app)
     
-    getattr(running_app, "init", lambda: None)()
-    result = run(running_app.update)
+    # GC tuning, trace, fade-in and a clean button queue for this app
+    appframe.start(app_path)
+    result = run(appframe.wrap(running_app.update))
     
     # Cleanup
+    snapshot.running(None, None)
     getattr(running_app, "on_exit", lambda: None)()
     if sys.path[0].startswith("/system/apps"):
         sys.path.pop(0)
@@ -50,14 +91,32 @@ def launch_app(app_path):
         if mod in sys.modules:
             del sys.modules[mod]
     
-    gc.collect()
+    appcache.keep(app_path, running_app)
+    running_app = None
+    
+    # Cached text runs and pooled shapes belong to the app's layout
+    textrun.clear()
+    pool.clear()
+    # Background jobs queued by the app have nobody left to collect them
+    worker.cancel()
+    
+    gcpolicy.collect()
+    # Stay within the resident budget, dropping the least recently used
+    appcache.trim()
+    gcpolicy.report()
+    buttons.report()
+    recorder.flush()
     return result
 
 
 # Determine what to launch
-if IS_HOME_RESET:
-    # HOME was pressed - show menu
-    current_app = "/system/apps/menu"
+state = None
+if IS_WATCHDOG_RESET:
+    # Something hung - show menu
+    current_app = appframe.MENU
+elif RESUME:
+    # Woken from deep sleep - straight back to the last screen
+    current_app, state = RESUME
 else:
     # Fresh boot - show badge app directly
     current_app = "/system/apps/badge"
@@ -65,11 +124,12 @@ else:
 
 # Main loop - allows navigation between apps
 while True:
-    result = launch_app(current_app)
+    result = launch_app(current_app, state)
+    state = None
     
     if result and isinstance(result, str):
         # App wants to launch another app
         current_app = result
     else:
         # App exited without specifying next app - go to menu
-        current_app = "/system/apps/menu"
+        current_app = appframe.MENU
@@ -7,9 +7,13 @@ import os
 sys.path.insert(0, "/system/apps/poweroff")
 os.chdir("/system/apps/poweroff")
 
-from badgeware import io, screen, run, brushes, shapes, PixelFont, display
-import machine
+from badgeware import io, screen, run, brushes, display
 import time
+import textrun
+import assets
+import pool
+import buttons
+import snapshot
 
 # Colors
 BLACK = brushes.color(0, 0, 0)
@@ -19,45 +23,51 @@ GREEN = brushes.color(211, 250, 55)
 RED = brushes.color(255, 80, 80)
 
 # Font
-try:
-    font = PixelFont.load("/system/assets/fonts/ark.ppf")
-    large_font = PixelFont.load("/system/assets/fonts/absolute.ppf")
-except:
-    font = None
-    large_font = None
+font = assets.font(assets.FONT_SMALL)
+large_font = assets.font(assets.FONT_LARGE)
 
 selected = 0  # 0 = Cancel, 1 = Power Off
 confirm_timer = 0
 
 
 def center_text(text, y, brush=WHITE, use_large=False):
-    if use_large and large_font:
-        screen.font = large_font
-    elif font:
-        screen.font = font
+    f = large_font if use_large and large_font else font
+    if f:
+        textrun.center(f, text, brush, 80, y)
+        return
     screen.brush = brush
     w, _ = screen.measure_text(text)
     screen.text(text, 80 - w // 2, y)
 
 
+def button_text(text, x, y, brush):
+    if font:
+        textrun.text(font, text, brush, x, y)
+    else:
+        screen.brush = brush
+        screen.text(text, x, y)
+
+
 def update():
     global selected, confirm_timer
     
+    presses = buttons.take()
+
     # Navigation
-    if io.BUTTON_A in io.pressed or io.BUTTON_LEFT in io.pressed:
+    if presses.get(io.BUTTON_A) or presses.get(io.BUTTON_LEFT):
         selected = 0
-    if io.BUTTON_C in io.pressed or io.BUTTON_RIGHT in io.pressed:
+    if presses.get(io.BUTTON_C) or presses.get(io.BUTTON_RIGHT):
         selected = 1
     
     # Cancel - return to menu
-    if io.BUTTON_B in io.pressed and selected == 0:
+    if presses.get(io.BUTTON_B) and selected == 0:
         return "/system/apps/menu"
     
     # Confirm power off
-    if io.BUTTON_B in io.pressed and selected == 1:
+    if presses.get(io.BUTTON_B) and selected == 1:
         # Show shutting down message
         screen.brush = BLACK
-        screen.draw(shapes.rectangle(0, 0, 160, 120))
+        screen.draw(pool.rect(0, 0, 160, 120))
         center_text("Shutting down...", 50, GREEN, True)
         center_text("Press RESET to wake", 75, GRAY)
         display.update()
@@ -65,22 +75,23 @@ def update():
         
         # Enter deep sleep (dormant mode)
         # Badge will wake on any button press or RESET
-        machine.deepsleep()
+        # Saves the screen to come back to, then sleeps
+        snapshot.deepsleep()
     
     # Draw UI
     screen.brush = BLACK
-    screen.draw(shapes.rectangle(0, 0, 160, 120))
+    screen.draw(pool.rect(0, 0, 160, 120))
     
     # Title
     center_text("Power Off?", 15, WHITE, True)
     
     # Icon (simple power symbol)
     screen.brush = RED
-    screen.draw(shapes.circle(80, 55, 20))
+    screen.draw(pool.circle(80, 55, 20))
     screen.brush = BLACK
-    screen.draw(shapes.circle(80, 55, 15))
+    screen.draw(pool.circle(80, 55, 15))
     screen.brush = RED
-    screen.draw(shapes.rectangle(77, 35, 6, 22))
+    screen.draw(pool.rect(77, 35, 6, 22))
     
     # Buttons
     btn_y = 95
@@ -92,20 +103,16 @@ def update():
         screen.brush = GREEN
     else:
         screen.brush = GRAY
-    screen.draw(shapes.rounded_rectangle(15, btn_y, btn_w, btn_h, 4))
-    screen.brush = BLACK
-    if font:
-        screen.font = font
-    screen.text("Cancel", 25, btn_y + 4)
+    screen.draw(pool.rounded_rect(15, btn_y, btn_w, btn_h, 4))
+    button_text("Cancel", 25, btn_y + 4, BLACK)
     
     # Power Off button  
     if selected == 1:
         screen.brush = RED
     else:
         screen.brush = GRAY
-    screen.draw(shapes.rounded_rectangle(85, btn_y, btn_w, btn_h, 4))
-    screen.brush = BLACK if selected == 1 else WHITE
-    screen.text("Power Off", 90, btn_y + 4)
+    screen.draw(pool.rounded_rect(85, btn_y, btn_w, btn_h, 4))
+    button_text("Power Off", 90, btn_y + 4, BLACK if selected == 1 else WHITE)
     
     return None
 
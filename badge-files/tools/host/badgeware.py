@@ -0,0 +1,184 @@
+# Host badgeware
+# Stand-in for the badge firmware's badgeware module on a Linux host
+# Used by tools/replay.py - not installed on the badge
+#
+# Nothing is rasterised: drawing calls are counted (draw_calls) so a replay
+# measures the mods' own per-frame work, which is what changes between
+# revisions. Inputs are plain attributes the replayer sets before each frame.
+
+import math
+import os
+
+draw_calls = 0  # drawing calls since the replayer last reset it
+
+
+class _Brush:
+    def __init__(self, *rgba):
+        self.rgba = rgba
+
+
+class brushes:
+    @staticmethod
+    def color(r, g, b, a=255):
+        return _Brush(r, g, b, a)
+
+
+class _Shape:
+    def __init__(self, *args):
+        self.args = args
+        self.transform = None
+
+
+class shapes:
+    @staticmethod
+    def rectangle(*args):
+        return _Shape(*args)
+
+    @staticmethod
+    def rounded_rectangle(*args):
+        return _Shape(*args)
+
+    @staticmethod
+    def circle(*args):
+        return _Shape(*args)
+
+    @staticmethod
+    def squircle(*args):
+        return _Shape(*args)
+
+
+class Matrix:
+    """2x3 affine transform - composing returns a new matrix of the same size,
+    as the firmware's does, so chains cost the same whatever their length"""
+
+    def __init__(self, a=1.0, b=0.0, c=0.0, d=1.0, tx=0.0, ty=0.0):
+        self.a = a
+        self.b = b
+        self.c = c
+        self.d = d
+        self.tx = tx
+        self.ty = ty
+
+    def _then(self, a, b, c, d, tx, ty):
+        # self x op: op applies first, in the space self has set up
+        return Matrix(self.a * a + self.c * b, self.b * a + self.d * b,
+                      self.a * c + self.c * d, self.b * c + self.d * d,
+                      self.a * tx + self.c * ty + self.tx, self.b * tx + self.d * ty + self.ty)
+
+    def translate(self, x, y):
+        return self._then(1.0, 0.0, 0.0, 1.0, x, y)
+
+    def rotate(self, degrees):
+        r = math.radians(degrees)
+        cos, sin = math.cos(r), math.sin(r)
+        return self._then(cos, sin, -sin, cos, 0.0, 0.0)
+
+    def scale(self, x, y=None):
+        return self._then(x, 0.0, 0.0, x if y is None else y, 0.0, 0.0)
+
+
+class PixelFont:
+    def __init__(self, path):
+        self.path = path
+
+    @classmethod
+    def load(cls, path):
+        # Fonts ship with the firmware - there are none to read on the host
+        return cls(path)
+
+
+class Image:
+    def __init__(self, width=0, height=0, pixels=None):
+        self.width = width
+        self.height = height
+        self.pixels = pixels
+        self.font = None
+        self.brush = None
+        self.alpha = 255
+
+    @classmethod
+    def load(cls, path):
+        # Reading the file is the cost that matters here; size is nominal
+        with open(path, "rb") as f:
+            f.read()
+        return cls(24, 24)
+
+    def _op(self):
+        global draw_calls
+        draw_calls += 1
+
+    def text(self, text, x, y):
+        self._op()
+
+    def draw(self, shape):
+        self._op()
+
+    def blit(self, image, x, y):
+        self._op()
+
+    def measure_text(self, text):
+        return len(text) * 5, 8
+
+
+class SpriteSheet:
+    def __init__(self, path, columns, rows):
+        self.image = Image.load(path)
+        self.columns = columns
+        self.rows = rows
+
+    def sprite(self, x, y):
+        return Image(self.image.width // self.columns, self.image.height // self.rows)
+
+
+screen = Image(160, 120)
+
+
+class _IO:
+    BUTTON_A = 1 << 0
+    BUTTON_B = 1 << 1
+    BUTTON_C = 1 << 2
+    BUTTON_UP = 1 << 3
+    BUTTON_DOWN = 1 << 4
+    BUTTON_LEFT = 1 << 5
+    BUTTON_RIGHT = 1 << 6
+    BUTTON_HOME = 1 << 7
+
+    def __init__(self):
+        self.ticks = 0
+        self.pressed = set()
+        self.held = set()
+        self.released = set()
+
+
+io = _IO()
+
+
+class display:
+    @staticmethod
+    def update():
+        pass
+
+
+def run(update):
+    """Call update() until it returns something - as the firmware does"""
+    while True:
+        result = update()
+        display.update()
+        if result is not None:
+            return result
+
+
+def file_exists(path):
+    return os.path.exists(path)
+
+
+def is_dir(path):
+    return os.path.isdir(path)
+
+
+def get_battery_level():
+    return 100
+
+
+def is_charging():
+    return True
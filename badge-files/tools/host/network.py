@@ -0,0 +1,21 @@
+# Host network
+# Stand-in for MicroPython's network module - always associated
+# Used by tools/replay.py - not installed on the badge
+
+STA_IF = 0
+
+
+class WLAN:
+    def __init__(self, interface):
+        self._active = False
+
+    def active(self, value=None):
+        if value is not None:
+            self._active = value
+        return self._active
+
+    def isconnected(self):
+        return True
+
+    def connect(self, ssid, password=None):
+        pass
@@ -0,0 +1,41 @@
+# Host urequest
+# Stand-in for the badge's urlopen that talks to the replay's local fixture
+# tools/replay.py installs this as urllib.urequest - not for the badge
+#
+# https://host/path?query becomes FIXTURE_BASE/host/path?query over plain
+# HTTP, so responses come back through a real socket at the recorded pace.
+
+import http.client
+from urllib.parse import urlsplit, quote
+
+FIXTURE_BASE = None  # (host, port) of the fixture server, set by the replayer
+
+
+class Response:
+    def __init__(self, conn, response):
+        self._conn = conn
+        self._response = response
+        self.status = response.status
+        self.headers = response.headers
+
+    def readinto(self, buf):
+        # At most what has arrived - like a socket, not a buffered file
+        data = self._response.read1(len(buf))
+        buf[:len(data)] = data
+        return len(data)
+
+    def read(self, size=-1):
+        return self._response.read() if size is None or size < 0 else self._response.read(size)
+
+    def close(self):
+        self._conn.close()
+
+
+def urlopen(url, data=None, method="GET", headers=None):
+    parts = urlsplit(url)
+    path = f"/{parts.netloc}{quote(parts.path or '/')}"
+    if parts.query:
+        path += f"?{parts.query}"
+    conn = http.client.HTTPConnection(*FIXTURE_BASE, timeout=30)
+    conn.request(method, path, body=data, headers=headers or {})
+    return Response(conn, conn.getresponse())
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+# Asset Packer
+# Packs the badge's fonts and app icons into one read-only blob
+# Runs on your computer, not the badge - see lib/assetpack.py for the loader
+#
+# Point it at the mounted badge (disk mode) or a copy of its files:
+#
+#   python3 pack_assets.py /Volumes/BADGER -o /Volumes/BADGER/assets.bin
+#
+# The launcher copies a new /assets.bin into the badge's ROM segment on the
+# next boot. With --raw-icons (needs Pillow) icons are stored as decoded
+# RGBA8888 pixels the badge can use in place without a PNG decode; re-pack
+# after adding apps or changing icons - anything not in the pack still loads
+# from its own file.
+
+import argparse
+import binascii
+import os
+import struct
+import sys
+
+# Keep in step with lib/assetpack.py
+MAGIC = b"BPAK"
+VERSION = 1
+HEADER = "<4sHHIII"
+HEADER_SIZE = struct.calcsize(HEADER)
+ENTRY = "<IIHHBB"
+ENTRY_SIZE = struct.calcsize(ENTRY)
+ALIGN = 8
+
+KIND_FILE = 0
+KIND_PIXELS = 1
+
+
+def collect(root):
+    """(badge path, host path) of every font and icon under root"""
+    found = []
+    fonts = os.path.join(root, "system", "assets", "fonts")
+    if os.path.isdir(fonts):
+        for name in sorted(os.listdir(fonts)):
+            if name.endswith(".ppf"):
+                found.append((f"/system/assets/fonts/{name}", os.path.join(fonts, name)))
+
+    apps = os.path.join(root, "system", "apps")
+    if os.path.isdir(apps):
+        for name in sorted(os.listdir(apps)):
+            for icon in ("icon.png", "default_icon.png"):
+                host = os.path.join(apps, name, icon)
+                if os.path.isfile(host):
+                    found.append((f"/system/apps/{name}/{icon}", host))
+    return found
+
+
+def decode(host):
+    """(width, height, RGBA8888 bytes) of a PNG"""
+    from PIL import Image
+    with Image.open(host) as img:
+        img = img.convert("RGBA")
+        return img.width, img.height, img.tobytes()
+
+
+def pad(n):
+    return (n + ALIGN - 1) // ALIGN * ALIGN
+
+
+def build(entries, raw_icons=False):
+    """The pack for [(badge path, host path)] as bytes"""
+    blobs = []
+    for name, host in entries:
+        if raw_icons and host.endswith(".png"):
+            w, h, data = decode(host)
+            blobs.append((name, KIND_PIXELS, w, h, data))
+        else:
+            with open(host, "rb") as f:
+                blobs.append((name, KIND_FILE, 0, 0, f.read()))
+
+    index_len = sum(ENTRY_SIZE + len(name.encode()) for name, *_ in blobs)
+    offset = pad(HEADER_SIZE + index_len)
+    index = bytearray()
+    body = bytearray()
+    for name, kind, w, h, data in blobs:
+        name_bytes = name.encode()
+        index += struct.pack(ENTRY, offset, len(data), w, h, kind, len(name_bytes)) + name_bytes
+        body += data + bytes(pad(len(data)) - len(data))
+        offset += pad(len(data))
+
+    rest = bytes(index) + bytes(pad(HEADER_SIZE + index_len) - HEADER_SIZE - index_len) + bytes(body)
+    size = HEADER_SIZE + len(rest)
+    head = struct.pack(HEADER, MAGIC, VERSION, len(blobs), index_len, size, binascii.crc32(rest) & 0xFFFFFFFF)
+    return head + rest
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pack badge fonts and icons into assets.bin")
+    parser.add_argument("root", help="the badge's files (its mounted drive, or a copy)")
+    parser.add_argument("-o", "--output", default="assets.bin")
+    parser.add_argument("--raw-icons", action="store_true",
+                        help="store icons as decoded RGBA8888 pixels (needs Pillow)")
+    args = parser.parse_args(argv)
+
+    entries = collect(args.root)
+    if not entries:
+        print(f"No fonts or icons found under {args.root}", file=sys.stderr)
+        return 1
+    if args.raw_icons:
+        try:
+            import PIL  # noqa: F401
+        except ImportError:
+            print("--raw-icons needs Pillow: pip install pillow", file=sys.stderr)
+            return 1
+
+    pack = build(entries, args.raw_icons)
+    with open(args.output, "wb") as f:
+        f.write(pack)
+    print(f"Packed {len(entries)} files into {args.output} ({len(pack)} bytes)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
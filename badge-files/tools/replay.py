@@ -0,0 +1,434 @@
+#!/usr/bin/env python3
+# Session Replayer
+# Feeds a trace recorded on the badge back into a mod on your computer
+# Runs on your computer, not the badge - see lib/recorder.py for the recorder
+#
+# Set RECORD_TRACE = True in main.py, use the badge, then copy /trace.bin off
+# it (disk mode). The replayer runs the mod's update() once per recorded
+# frame, wrapped in the launcher's per-frame services (lib/appframe.py), with
+# the recorded buttons and io.ticks, against tools/host stand-ins
+# for badgeware and the network. Requests go to a local HTTP fixture that
+# sends each response in the chunk sizes and at the pace recorded on the
+# badge. It reports frame times, heap (tracemalloc) and draw calls:
+#
+#   python3 replay.py trace.bin                    replay against this tree
+#   python3 replay.py trace.bin --against HEAD~3   ...and compare with a revision
+#   python3 replay.py trace.bin --fast             don't wait out recorded gaps
+#
+# Responses come from --fixtures DIR (DIR/<host>/<path>, "index" for "/") or
+# are made up for the GitHub URLs the badge app uses. Host timings are not
+# badge timings - compare revisions with each other, not with the badge.
+
+import argparse
+import builtins
+import http.client
+import http.server
+import importlib.util
+import json
+import os
+import shutil
+import struct
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+import urllib.parse
+
+TOOLS = os.path.dirname(os.path.abspath(__file__))
+TREE = os.path.dirname(TOOLS)
+
+# Keep in step with lib/recorder.py
+MAGIC = b"BTRC"
+VERSION = 1
+BUTTONS = ("A", "B", "C", "UP", "DOWN", "LEFT", "RIGHT", "HOME")
+
+# Where the mods are installed on the badge
+MODS = {
+    "/system/apps/badge": "clean-badge",
+    "/system/apps/menu": "clean-menu",
+    "/system/apps/startup": "bootlog-startup",
+}
+
+# Paths the mods use that belong in the sandbox rather than on the host
+BADGE_DIRS = ("system", "profiles", "pack")
+
+
+# ============================================================================
+# TRACE
+# ============================================================================
+def read_trace(path):
+    """Recorded launches as [{"app", "frames", "requests"}]
+
+    frames are (ms, pressed mask, held mask); requests are (ms, url, chunks)
+    with chunks as (ms after the request, bytes). Times are ms since the
+    trace started.
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    magic, version, _ = struct.unpack_from("<4sBxxxI", data, 0)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"{path} is not a version {VERSION} trace")
+
+    segments = []
+    segment = None
+    request = None
+    now = 0
+    pos = 12
+    while pos < len(data):
+        tag = data[pos:pos + 1]
+        if tag in (b"A", b"U"):
+            _, dt, length = struct.unpack_from("<cHB", data, pos)
+            pos += 4
+            text = data[pos:pos + length].decode()
+            pos += length
+        elif tag == b"F":
+            _, dt, pressed, held = struct.unpack_from("<cHHH", data, pos)
+            pos += 7
+        elif tag == b"N":
+            _, dt, count = struct.unpack_from("<cHH", data, pos)
+            pos += 5
+        else:
+            print(f"Trace damaged at byte {pos} - replaying what came before", file=sys.stderr)
+            break
+        now += dt
+
+        if tag == b"A":
+            segment = {"app": text, "frames": [], "requests": []}
+            segments.append(segment)
+            request = None
+        elif segment is None:
+            continue
+        elif tag == b"F":
+            segment["frames"].append((now, pressed, held))
+        elif tag == b"U":
+            request = (now, text, [])
+            segment["requests"].append(request)
+        elif request is not None:
+            request[2].append((now - request[0], count))
+    return segments
+
+
+# ============================================================================
+# HTTP FIXTURE
+# ============================================================================
+def made_up(host, path):
+    """A stand-in response for the URLs the badge app fetches, or None"""
+    if host == "api.github.com" and path.startswith("/users/"):
+        login = path.rsplit("/", 1)[1]
+        return json.dumps({"login": login, "name": login.title(), "followers": 42,
+                           "public_repos": 17}).encode()
+    if host == "github.com" and path.endswith(".contribs"):
+        weeks = [{"contribution_days": [{"level": (w * 7 + d) % 5, "count": (w + d) % 9}
+                                        for d in range(7)]} for w in range(53)]
+        return json.dumps({"total_contributions": 1234, "weeks": weeks}).encode()
+    if host == "wsrv.nl":
+        return b"\x89PNG\r\n\x1a\n" + bytes(4000)
+    return None
+
+
+class Fixture(http.server.ThreadingHTTPServer):
+    """Serves responses paced like the recorded ones, for the same URLs in order"""
+
+    daemon_threads = True
+
+    def __init__(self, requests, fixtures=None, fast=False):
+        super().__init__(("127.0.0.1", 0), FixtureHandler)
+        self.fixtures = fixtures
+        self.fast = fast
+        self.sent = 0
+        self.lock = threading.Lock()
+        self.schedules = {}
+        for _, url, chunks in requests:
+            self.schedules.setdefault(url, []).append(chunks)
+
+    def body(self, host, path):
+        if self.fixtures:
+            local = os.path.join(self.fixtures, host, path.strip("/") or "index")
+            if os.path.isfile(local):
+                with open(local, "rb") as f:
+                    return f.read()
+        return made_up(host, path)
+
+    def schedule(self, url):
+        with self.lock:
+            pending = self.schedules.get(url)
+            return pending.pop(0) if pending else []
+
+
+class FixtureHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        parts = urllib.parse.urlsplit(self.path)
+        host, _, path = parts.path.lstrip("/").partition("/")
+        path = urllib.parse.unquote("/" + path)
+        body = self.server.body(host, path)
+        if body is None:
+            self.send_error(404)
+            return
+
+        url = f"https://{host}{path}" + (f"?{parts.query}" if parts.query else "")
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+
+        start = time.monotonic()
+        pos = 0
+        for at_ms, count in self.server.schedule(url):
+            if pos >= len(body):
+                break
+            if not self.server.fast:
+                delay = start + at_ms / 1000 - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+            self.wfile.write(body[pos:pos + count])
+            self.wfile.flush()
+            pos += count
+        self.wfile.write(body[pos:])
+        with self.server.lock:
+            self.server.sent += len(body)
+
+    def log_message(self, *args):
+        pass
+
+
+# ============================================================================
+# HOST ENVIRONMENT
+# ============================================================================
+def sandbox(root):
+    """Send the badge's absolute paths (/profiles/..., /badge.bin) into root"""
+    real_stat = os.stat
+
+    def host_dir(path):
+        try:
+            return real_stat(path).st_mode & 0o170000 == 0o040000
+        except OSError:
+            return False
+
+    def badge_path(path):
+        if not isinstance(path, str) or not path.startswith("/") or path.startswith(root):
+            return path
+        top = path[1:].split("/", 1)[0]
+        if top in BADGE_DIRS or ("/" not in path[1:] and not host_dir(path)):
+            return root + path
+        return path
+
+    real_open = builtins.open
+    builtins.open = lambda path, *args, **kwargs: real_open(badge_path(path), *args, **kwargs)
+    for name in ("stat", "remove", "listdir", "mkdir"):
+        real = getattr(os, name)
+        setattr(os, name, (lambda real: lambda path, *args, **kwargs: real(badge_path(path), *args, **kwargs))(real))
+    real_rename = os.rename
+    os.rename = lambda a, b: real_rename(badge_path(a), badge_path(b))
+    # Apps chdir into their install folder, which only exists on the badge
+    os.chdir = lambda path: None
+
+
+def micropython_time():
+    time.ticks_ms = lambda: int(time.monotonic() * 1000)
+    time.ticks_us = lambda: int(time.monotonic() * 1000000)
+    time.ticks_add = lambda a, b: a + b
+    time.ticks_diff = lambda a, b: a - b
+    time.sleep_ms = lambda ms: time.sleep(ms / 1000)
+
+
+def prepare(tree, root, handle, port):
+    micropython_time()
+    # The mods installed where the badge has them, for the menus to list
+    for app_path, mod in MODS.items():
+        shutil.copytree(os.path.join(tree, "mods", mod), root + app_path,
+                        ignore=shutil.ignore_patterns("__pycache__"))
+    sandbox(root)
+    secrets = os.path.join(root, "secrets.py")
+    if not os.path.exists(secrets):
+        with open(secrets, "w") as f:
+            f.write(f'WIFI_SSID = "replay"\nWIFI_PASSWORD = None\nGITHUB_USERNAME = "{handle}"\nGITHUB_TOKEN = None\n')
+
+    # Host stand-ins first, then the tree's /lib, then the badge root for secrets.py
+    sys.path[:0] = [os.path.join(TOOLS, "host"), os.path.join(tree, "lib"), root]
+    sys.modules.pop("secrets", None)
+
+    spec = importlib.util.spec_from_file_location("urllib.urequest", os.path.join(TOOLS, "host", "urequest.py"))
+    urequest = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(urequest)
+    urequest.FIXTURE_BASE = ("127.0.0.1", port)
+    sys.modules["urllib.urequest"] = urequest
+    urllib.urequest = urequest
+
+
+def load_mod(tree, mod):
+    spec = importlib.util.spec_from_file_location("replayed_app", os.path.join(tree, "mods", mod, "__init__.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+# ============================================================================
+# REPLAY
+# ============================================================================
+def percentile(values, p):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * p))] if ordered else 0
+
+
+def replay(args):
+    segments = [s for s in read_trace(args.trace) if s["frames"]]
+    if not segments:
+        raise SystemExit(f"{args.trace} has no frames")
+    app = args.app or max(segments, key=lambda s: len(s["frames"]))["app"]
+    segments = [s for s in segments if s["app"] == app]
+    mod = args.mod or MODS.get(app)
+    if mod is None:
+        raise SystemExit(f"Which mod is {app}? Pass --mod")
+
+    server = Fixture([r for s in segments for r in s["requests"]], args.fixtures, args.fast)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    with tempfile.TemporaryDirectory() as root:
+        prepare(args.tree, root, args.handle, server.server_address[1])
+        tracemalloc.start()
+        try:
+            import appframe
+        except ImportError:
+            appframe = None  # a revision from before lib/appframe.py
+        if appframe:
+            # As main.py does at boot - the sensor service samples WiFi from
+            # the first frame on
+            import wifi
+            wifi.start()
+        module = load_mod(args.tree, mod)
+        import badgeware
+        frame = appframe.wrap(module.update) if appframe else module.update
+        codes = [getattr(badgeware.io, f"BUTTON_{name}") for name in BUTTONS]
+
+        def buttons_in(mask):
+            return {code for i, code in enumerate(codes) if mask >> i & 1}
+
+        frame_ms = []
+        heap = []
+        draws = []
+        for n, segment in enumerate(segments):
+            if n:
+                # Relaunched - the launcher keeps it resident, so no re-import
+                getattr(module, "init", lambda: None)()
+            if appframe:
+                appframe.start(app)
+            wall = time.monotonic()
+            first = segment["frames"][0][0]
+            for at, pressed, held in segment["frames"]:
+                if not args.fast:
+                    delay = wall + (at - first) / 1000 - time.monotonic()
+                    if delay > 0:
+                        time.sleep(delay)
+                badgeware.io.ticks = at
+                badgeware.io.pressed = buttons_in(pressed)
+                badgeware.io.held = buttons_in(held)
+                badgeware.draw_calls = 0
+
+                start = time.perf_counter()
+                frame()
+                frame_ms.append((time.perf_counter() - start) * 1000)
+                heap.append(tracemalloc.get_traced_memory()[0])
+                draws.append(badgeware.draw_calls)
+
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    server.shutdown()
+
+    return {
+        "app": app,
+        "mod": mod,
+        "frames": len(frame_ms),
+        "frame_ms_mean": sum(frame_ms) / len(frame_ms),
+        "frame_ms_p50": percentile(frame_ms, 0.5),
+        "frame_ms_p95": percentile(frame_ms, 0.95),
+        "frame_ms_max": max(frame_ms),
+        "heap_kb_end": heap[-1] / 1024,
+        "heap_kb_peak": peak / 1024,
+        "draw_calls_mean": sum(draws) / len(draws),
+        "net_bytes": server.sent,
+    }
+
+
+ROWS = (
+    ("frames", "frames", "{:.0f}"),
+    ("frame_ms_mean", "frame ms (mean)", "{:.3f}"),
+    ("frame_ms_p50", "frame ms (p50)", "{:.3f}"),
+    ("frame_ms_p95", "frame ms (p95)", "{:.3f}"),
+    ("frame_ms_max", "frame ms (max)", "{:.3f}"),
+    ("heap_kb_end", "heap KB (end)", "{:.1f}"),
+    ("heap_kb_peak", "heap KB (peak)", "{:.1f}"),
+    ("draw_calls_mean", "draw calls/frame", "{:.1f}"),
+    ("net_bytes", "network bytes", "{:.0f}"),
+)
+
+
+def show(results, baseline=None):
+    print(f"{results['app']} replayed with mods/{results['mod']}")
+    for key, label, fmt in ROWS:
+        line = f"  {label:<18} {fmt.format(results[key]):>12}"
+        if baseline is not None:
+            before = baseline[key]
+            change = f"{(results[key] - before) / before * 100:+.1f}%" if before else "n/a"
+            line = f"  {label:<18} {fmt.format(before):>12} -> {fmt.format(results[key]):>12}  {change:>8}"
+        print(line)
+
+
+def run_child(args, tree, out):
+    """Replay in a fresh interpreter, so module state can't leak between trees"""
+    cmd = [sys.executable, os.path.abspath(__file__), args.trace, "--tree", tree, "--json", out,
+           "--handle", args.handle]
+    for flag in ("app", "mod", "fixtures"):
+        if getattr(args, flag):
+            cmd += [f"--{flag}", getattr(args, flag)]
+    if args.fast:
+        cmd.append("--fast")
+    subprocess.run(cmd, check=True, stdout=subprocess.DEVNULL)
+    with open(out) as f:
+        return json.load(f)
+
+
+def against(args):
+    """Replay this tree and args.against's, and show the difference"""
+    top = subprocess.run(["git", "-C", args.tree, "rev-parse", "--show-toplevel"],
+                         check=True, capture_output=True, text=True).stdout.strip()
+    prefix = os.path.relpath(os.path.abspath(args.tree), top)
+    with tempfile.TemporaryDirectory() as tmp:
+        archive = subprocess.run(["git", "-C", top, "archive", args.against, prefix],
+                                 check=True, capture_output=True).stdout
+        subprocess.run(["tar", "-x", "-C", tmp], input=archive, check=True)
+        baseline = run_child(args, os.path.join(tmp, prefix), os.path.join(tmp, "base.json"))
+        current = run_child(args, args.tree, os.path.join(tmp, "head.json"))
+    print(f"{args.against} -> working tree")
+    show(current, baseline)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay a badge session trace on this computer")
+    parser.add_argument("trace", help="trace.bin recorded on the badge")
+    parser.add_argument("--tree", default=TREE, help="badge-files folder to run (default: this one)")
+    parser.add_argument("--app", help="recorded app to replay (default: the one with the most frames)")
+    parser.add_argument("--mod", help="mod to run for it (default: from where it is installed)")
+    parser.add_argument("--fixtures", help="folder of responses as <host>/<path>")
+    parser.add_argument("--handle", default="octocat", help="GITHUB_USERNAME for the sandbox secrets.py")
+    parser.add_argument("--fast", action="store_true", help="replay without waiting out recorded gaps")
+    parser.add_argument("--against", metavar="REV", help="also replay this git revision and compare")
+    parser.add_argument("--json", help="write the results here as JSON")
+    args = parser.parse_args(argv)
+
+    if args.against:
+        against(args)
+        return 0
+
+    results = replay(args)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f)
+    show(results)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
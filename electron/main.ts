@@ -532,6 +532,12 @@ ipcMain.handle('badge:installMod', async (_event, modName: string) => {
     
     // Copy mod to target
     await fs.promises.copyFile(modSourcePath, targetPath)
+
+    // Mods share helper modules from badge-files/lib, installed to /lib
+    const libSourcePath = path.join(appPath, '..', 'lib')
+    if (fs.existsSync(libSourcePath)) {
+      await copyFolder(libSourcePath, path.join(badgeInfo.path, 'lib'))
+    }
     
     return { 
       success: true, 